@@ -0,0 +1,107 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Memory Benchmark
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+Measures how much memory a large population of characters takes as
+slotted Character objects compared with the plain dictionaries that
+create_character used to return.
+
+Usage:
+    python benchmarks/bench_characters.py
+    python benchmarks/bench_characters.py --counts 1000 300000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+DEFAULT_COUNTS = [10000, 300000]
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def make_dict_character(name, character_class):
+    """
+    Builds a character the way create_character did before Character
+    existed: a plain dictionary.
+    """
+    character = character_manager.create_character(name, character_class)
+    return character_manager.copy_character(character)
+
+
+def measure(factory, count):
+    """
+    Returns the bytes allocated to keep count characters alive, excluding
+    their names (which are the same strings either way).
+    """
+    names = [f"Hero{i}" for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    characters = [factory(name, CLASSES[i % len(CLASSES)]) for i, name in enumerate(names)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del characters
+    return after - before
+
+
+def run_benchmarks(counts):
+    """
+    Measures both representations at each count. Returns a list of results.
+    """
+    results = []
+    for count in counts:
+        slotted = measure(character_manager.create_character, count)
+        plain = measure(make_dict_character, count)
+        results.append({
+            "count": count,
+            "dict_bytes": plain,
+            "character_bytes": slotted,
+        })
+    return results
+
+
+def print_results(results):
+    """
+    Prints bytes per character for each representation.
+    """
+    print(f"{'characters':>10}  {'dict B/char':>12}  {'Character B/char':>16}  {'saved':>6}")
+    for result in results:
+        count = result["count"]
+        per_dict = result["dict_bytes"] / count
+        per_character = result["character_bytes"] / count
+        saved = 1 - per_character / per_dict
+        print(f"{count:>10}  {per_dict:>12.0f}  {per_character:>16.0f}  {saved:>6.0%}")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark character memory use.")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS,
+                        help="characters to keep alive (default: 10k, 300k)")
+    args = parser.parse_args(argv)
+
+    print_results(run_benchmarks(args.counts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Data Benchmarks
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+Generates synthetic quests.txt/items.txt files and measures how fast
+game_data loads and validates them.
+
+Usage:
+    python benchmarks/bench_game_data.py                      # compare with baseline
+    python benchmarks/bench_game_data.py --sizes 1000 100000
+    python benchmarks/bench_game_data.py --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Inputs up to this many records are timed SMALL_RUN_REPEATS times
+SMALL_RUN_LIMIT = 10000
+SMALL_RUN_REPEATS = 5
+
+# A result slower than baseline by more than this fraction is a regression
+DEFAULT_TOLERANCE = 0.25
+
+ITEM_STATS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health", "magic"],
+    "consumable": ["health", "strength", "magic"]
+}
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def generate_quests(filename, count, seed=163):
+    """
+    Writes count quests to filename.
+
+    Quests are grouped into prerequisite chains of 1-10 quests, the way
+    story lines are authored, with required levels rising along each chain.
+    """
+
+    rng = random.Random(seed)
+    with open(filename, "w", encoding="utf-8") as f:
+        quest_number = 0
+        while quest_number < count:
+            chain_length = min(rng.randint(1, 10), count - quest_number)
+            prerequisite = "NONE"
+            level = rng.randint(1, 5)
+            for _ in range(chain_length):
+                quest_id = f"quest_{quest_number}"
+                f.write(
+                    f"QUEST_ID: {quest_id}\n"
+                    f"TITLE: Synthetic Quest {quest_number}\n"
+                    f"DESCRIPTION: Generated quest number {quest_number} for benchmarking.\n"
+                    f"REWARD_XP: {rng.randint(10, 1000)}\n"
+                    f"REWARD_GOLD: {rng.randint(5, 500)}\n"
+                    f"REQUIRED_LEVEL: {level}\n"
+                    f"PREREQUISITE: {prerequisite}\n\n"
+                )
+                prerequisite = quest_id
+                level += rng.randint(0, 2)
+                quest_number += 1
+
+
+def generate_items(filename, count, seed=163):
+    """
+    Writes count items to filename, cycling through every item type.
+    """
+
+    rng = random.Random(seed)
+    item_types = list(ITEM_STATS)
+    with open(filename, "w", encoding="utf-8") as f:
+        for item_number in range(count):
+            item_type = item_types[item_number % len(item_types)]
+            stat = rng.choice(ITEM_STATS[item_type])
+            f.write(
+                f"ITEM_ID: item_{item_number}\n"
+                f"NAME: Synthetic {item_type.title()} {item_number}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {stat}:{rng.randint(1, 50)}\n"
+                f"COST: {rng.randint(1, 1000)}\n"
+                f"DESCRIPTION: Generated {item_type} for benchmarking.\n\n"
+            )
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(func, record_count):
+    """
+    Returns func's result, throughput and peak traced memory.
+
+    tracemalloc slows the code it traces, so the timed runs and the memory
+    run are separate. Small inputs are timed several times and the best
+    run is kept, since a single run is mostly noise.
+    """
+
+    repeats = SMALL_RUN_REPEATS if record_count <= SMALL_RUN_LIMIT else 1
+    elapsed = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        run_time = time.perf_counter() - start
+        del result
+        if elapsed is None or run_time < elapsed:
+            elapsed = run_time
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        "seconds": round(elapsed, 4),
+        "records_per_sec": round(record_count / elapsed) if elapsed else None,
+        "peak_memory_mb": round(peak / (1024 * 1024), 2)
+    }
+
+
+def run_benchmarks(sizes):
+    """
+    Generates data for each size and times the loaders and validators.
+
+    Returns {"<size>": {"load_quests": {...}, ...}}.
+    """
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="quest_bench_")
+    try:
+        for size in sizes:
+            quest_file = os.path.join(work_dir, f"quests_{size}.txt")
+            item_file = os.path.join(work_dir, f"items_{size}.txt")
+            generate_quests(quest_file, size)
+            generate_items(item_file, size)
+
+            # Snapshots are skipped so the text parser itself is measured
+            quests, load_quests = measure(
+                lambda: game_data.load_quests(quest_file, use_snapshot=False), size)
+            items, load_items = measure(
+                lambda: game_data.load_items(item_file, use_snapshot=False), size)
+            _, validate_quests = measure(
+                lambda: [game_data.validate_quest_data(q) for q in quests.values()], size)
+            _, validate_items = measure(
+                lambda: [game_data.validate_item_data(i) for i in items.values()], size)
+
+            results[str(size)] = {
+                "load_quests": load_quests,
+                "load_items": load_items,
+                "validate_quest_data": validate_quests,
+                "validate_item_data": validate_items
+            }
+
+            del quests, items
+            os.remove(quest_file)
+            os.remove(item_file)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Returns a list of regression messages for results slower than the
+    baseline by more than tolerance.
+    """
+
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not previous or not previous.get("records_per_sec"):
+                continue
+            allowed = previous["records_per_sec"] * (1 - tolerance)
+            if current["records_per_sec"] < allowed:
+                regressions.append(
+                    f"{name} @ {size}: {current['records_per_sec']} rec/s "
+                    f"(baseline {previous['records_per_sec']} rec/s)"
+                )
+    return regressions
+
+
+def print_results(results):
+    """
+    Prints one line per benchmark.
+    """
+
+    print(f"{'size':>9}  {'benchmark':<22} {'seconds':>9} {'records/sec':>12} {'peak MB':>9}")
+    for size, benchmarks in results.items():
+        for name, r in benchmarks.items():
+            print(f"{size:>9}  {name:<22} {r['seconds']:>9} {r['records_per_sec']:>12} "
+                  f"{r['peak_memory_mb']:>9}")
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns 1 if a regression was found.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark game_data loaders.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="record counts to generate (default: 1k, 100k, 1M)")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline JSON file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before reporting a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes)
+    print_results(results)
+
+    if args.save_baseline:
+        baseline = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,116 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import sys
+import asyncio
+import weakref
+import time
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import character_storage
+import progression
+from game_records import Character
 from custom_exceptions import (
     InvalidCharacterClassError,
-    CharacterNotFoundError,
-    SaveFileCorruptedError,
     InvalidSaveDataError,
     CharacterDeadError
 )
 
+# fsync policies for save files. Every save is written to a temp file and
+# renamed over the old one, so a crash never leaves a half-written save;
+# the policy decides how hard we push the data to disk first.
+FSYNC_NONE = "none"   # rename only; leave flushing to the OS
+FSYNC_FILE = "file"   # fsync the temp file before the rename
+FSYNC_FULL = "full"   # also fsync the directory so the rename is durable
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_FILE, FSYNC_FULL)
+DEFAULT_FSYNC_POLICY = FSYNC_FILE
+
+DEFAULT_SAVE_DIRECTORY = "data/save_games"
+
+# Save file formats. Text saves are "<name>_save.txt" with one "KEY: value"
+# line per field; binary saves are "<name>_save.bin" (see
+# format_binary_save_data)
+TEXT_SAVE_FORMAT = "text"
+BINARY_SAVE_FORMAT = "binary"
+SAVE_FORMATS = (TEXT_SAVE_FORMAT, BINARY_SAVE_FORMAT)
+SAVE_SUFFIXES = {TEXT_SAVE_FORMAT: "_save.txt", BINARY_SAVE_FORMAT: "_save.bin"}
+
+# Binary save layout, version 1 (all little-endian):
+#   header     magic b"QCSV", version byte, the NUMERIC_FIELDS as 64-bit
+#              signed ints, uint16 counts of distinct IDs, of each
+#              LIST_FIELD and of extra fields, then the uint32 byte length
+#              of the strings
+#   lists      uint16 indexes into the ID table, one per list entry
+#   strings    UTF-8 text of NUL-separated strings: name, class, the ID
+#              table, then key and value of each extra field
+BINARY_SAVE_MAGIC = b"QCSV"
+BINARY_SAVE_VERSION = 1
+NUMERIC_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+_BINARY_HEADER = struct.Struct("<4sB")
+_BINARY_V1_FIXED = struct.Struct(f"<4sB{len(NUMERIC_FIELDS)}q{2 + len(LIST_FIELDS)}HI")
+
+# Threads used by load_characters / save_characters when not specified
+DEFAULT_BULK_WORKERS = 8
+
+# Bounds of the loaded-character cache in front of load_character
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+
+# Store installed by set_store, and the file stores made per directory
+_store = None
+_file_stores = {}
+
+# Seconds a WriteBehindSaver waits before writing a character, so repeated
+# saves inside the window become one write
+DEFAULT_SAVE_WINDOW = 2.0
+
+# Most store operations the async API runs at once on each event loop
+DEFAULT_ASYNC_IO_LIMIT = 16
+
+# ============================================================================
+# DIRTY TRACKING
+# ============================================================================
+
+def is_tracked(character):
+    """
+    Returns True if a character tracks which of its fields changed.
+
+    Characters from create_character and the loaders do; plain dicts
+    don't.
+    """
+    return type(character) is Character
+
+
+def mark_dirty(character, *fields):
+    """
+    Records that fields of a character were changed in place.
+    """
+    if type(character) is Character:
+        character.mark_dirty(*fields)
+
+
+def mark_clean(character):
+    """
+    Forgets a character's changes, e.g. once they have been saved.
+    """
+    if type(character) is Character:
+        character.mark_clean()
+
+
+def is_dirty(character):
+    """
+    Returns True if a character may have changed since it was last saved
+    or loaded. Untracked (plain dict) characters always count as dirty.
+    """
+    if type(character) is Character:
+        return character.is_dirty()
+    return True
+
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -25,7 +127,8 @@ from custom_exceptions import (
 def create_character(name, character_class):
     """
     Create a new character with stats based on class.
-    Returns a dictionary containing all character attributes.
+    Returns a Character, which is used like a dictionary of all character
+    attributes.
     """
 
     # Dictionary defining allowed classes and their base stats
@@ -43,8 +146,8 @@ def create_character(name, character_class):
     # Retrieve base stats for the chosen class
     base = valid_classes[character_class]
 
-    # Create the character dictionary with all required fields
-    character = {
+    # Create the character with all required fields
+    character = Character.from_dict({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -57,64 +160,387 @@ def create_character(name, character_class):
         "inventory": [],
         "active_quests": [],
         "completed_quests": []
-    }
+    })
 
     return character
 
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory=None, force=False):
     """
     Saves a character dictionary to a text file.
     Creates the directory if it does not exist.
+
+    The save goes through the store for save_directory (see get_store).
+    Nothing is written if the character has not changed since it was last
+    saved or loaded and its save exists, unless force is True.
     """
+    return store_character(get_store(save_directory), character, force)
 
-    # Ensure the save directory exists
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
 
-    # Construct full file path
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+def load_character(character_name, save_directory=None):
+    """
+    Loads a character from a save file and returns it as a dictionary.
+    Also validates the data format.
+    """
+    return fetch_character(get_store(save_directory), character_name)
 
-    try:
-        with open(filename, "w") as f:
-            # Write each character field to the save file
-            for key, value in character.items():
-                # Convert lists into comma-separated strings
-                if isinstance(value, list):
-                    value = ",".join(value)
-                f.write(f"{key.upper()}: {value}\n")
-        return True
 
-    except (PermissionError, IOError) as e:
-        # Let file I/O errors propagate upward
-        raise e
+def list_saved_characters(save_directory=None):
+    """
+    Returns a list of saved character names (without file extensions).
+    """
+    return get_store(save_directory).list_saved_characters()
 
 
-def load_character(character_name, save_directory="data/save_games"):
+def query_saved_characters(save_directory=None, character_class=None, min_level=None,
+                           max_level=None, where=None, sort_by="name", descending=False,
+                           offset=0, limit=None):
     """
-    Loads a character from a save file and returns it as a dictionary.
-    Also validates the data format.
+    Lists saved characters by their summaries (name, class, level, gold,
+    mtime and size of the save) without opening any saves; file stores
+    read them from the save directory's manifest.
+
+    Keeps characters of character_class, within min_level..max_level and
+    for which where(summary) is true, sorted by the sort_by field (ties by
+    name). offset and limit select a page. Returns a dictionary with the
+    page of "characters" and the "total" number that matched.
     """
 
-    # Build filename
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    matches = []
+    for summary in get_store(save_directory).character_summaries():
+        if character_class is not None and summary["class"] != character_class:
+            continue
+        if min_level is not None and summary["level"] < min_level:
+            continue
+        if max_level is not None and summary["level"] > max_level:
+            continue
+        if where is not None and not where(summary):
+            continue
+        matches.append(summary)
+
+    # Sorts are stable, so sorting by name first breaks ties by name.
+    # Missing values (e.g. no mtime outside file stores) go last.
+    matches.sort(key=lambda summary: summary["name"])
+    missing = [summary for summary in matches if summary[sort_by] is None]
+    matches = [summary for summary in matches if summary[sort_by] is not None]
+    matches.sort(key=lambda summary: summary[sort_by], reverse=descending)
+    matches += missing
+    end = None if limit is None else offset + limit
+    return {"characters": matches[offset:end], "total": len(matches)}
+
+
+def rebuild_manifest(save_directory=None):
+    """
+    Regenerates a save directory's manifest from the saves on disk.
+    Returns a dictionary with the "indexed" count and the names of saves
+    that "failed" to load.
+    """
+    store = get_store(save_directory)
+    if not isinstance(store, character_storage.FileCharacterStore):
+        raise TypeError(f"{type(store).__name__} does not keep a manifest")
+    return store.rebuild_manifest()
+
+
+def delete_character(character_name, save_directory=None):
+    """
+    Deletes a saved character file.
+    Throws an error if the file does not exist.
+    """
+    store = get_store(save_directory)
+    character_cache.invalidate(store, character_name)
+    return store.delete_character(character_name)
+
 
-    # Save file must exist
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"No save found for: {character_name}")
+def load_characters(names, save_directory=None, max_workers=None):
+    """
+    Loads many characters, spreading the I/O over a thread pool of at most
+    max_workers threads (DEFAULT_BULK_WORKERS by default).
+
+    One bad save doesn't stop the batch: returns a dictionary with
+    "characters" (name -> character, in the order given) and "errors"
+    (name -> the exception its load raised, e.g. CharacterNotFoundError
+    or InvalidSaveDataError).
+    """
 
-    # Try reading the file
+    store = get_store(save_directory)
+    names = list(dict.fromkeys(names))
+    characters, errors = _run_bulk(lambda name: fetch_character(store, name),
+                                   names, names, max_workers)
+    return {"characters": characters, "errors": errors}
+
+
+def save_characters(characters, save_directory=None, force=False, max_workers=None):
+    """
+    Saves many characters, spreading the I/O over a thread pool of at most
+    max_workers threads (DEFAULT_BULK_WORKERS by default).
+
+    One failed save doesn't stop the batch: returns a dictionary with
+    "saved" (the names saved, in order) and "errors" (name -> the
+    exception its save raised). If a name appears more than once, only
+    its last character is saved.
+    """
+
+    # One save per name, or workers would write the same file at once;
+    # the last copy of a name is the one saved
+    store = get_store(save_directory)
+    by_name = {character["name"]: character for character in characters}
+    characters = list(by_name.values())
+    names = list(by_name)
+    saved, errors = _run_bulk(lambda character: store_character(store, character, force),
+                              characters, names, max_workers)
+    return {"saved": list(saved), "errors": errors}
+
+
+def _run_bulk(func, args, names, max_workers=None):
+    """
+    Calls func on each argument in a thread pool. Returns name -> result
+    for the calls that worked, in order, and name -> exception for the rest.
+    """
+
+    if max_workers is None:
+        max_workers = DEFAULT_BULK_WORKERS
+
+    def attempt(arg):
+        try:
+            return True, func(arg)
+        except Exception as e:
+            return False, e
+
+    # A pool only adds overhead for a single call
+    if len(args) <= 1 or max_workers == 1:
+        outcomes = [attempt(arg) for arg in args]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(args))) as pool:
+            outcomes = list(pool.map(attempt, args))
+
+    results = {}
+    errors = {}
+    for name, (ok, value) in zip(names, outcomes):
+        if ok:
+            results[name] = value
+        else:
+            errors[name] = value
+    return results, errors
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    Bounded LRU cache of saved characters, keyed by store location
+    (CharacterStore.cache_key) and name.
+
+    load_character serves repeated loads of the same character from here
+    without reading its save; save_character updates the entry and
+    delete_character drops it. Each entry keeps the store's cache_token
+    for the save at the time it was cached, and a lookup whose token no
+    longer matches is a miss, so saves changed behind the cache's back
+    (edited by hand, deleted, written by another process) are reloaded.
+    Entries are copies, and every hit returns a fresh copy, so changing a
+    loaded character never changes the cache.
+    The least recently used entries are evicted once there are more than
+    max_entries of them or their estimated size passes max_bytes.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()   # (store key, name) -> (character copy, size, token)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, store, name, token=None):
+        """
+        Returns a copy of the cached character, or None on a miss. An entry
+        cached with a different token is dropped and counts as a miss.
+        """
+        key = (store.cache_key, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] != token:
+                del self._entries[key]
+                self._bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return Character.from_dict(copy_character(entry[0]), dirty=False)
+
+    def put(self, store, character, token=None):
+        """
+        Caches a copy of character along with the store's cache_token for
+        its save, evicting old entries to stay in bounds.
+        """
+        key = (store.cache_key, character["name"])
+        entry = copy_character(character)
+        size = estimate_character_size(entry)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_entries <= 0 or size > self.max_bytes:
+                return
+
+            self._entries[key] = (entry, size, token)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, store, name):
+        """
+        Drops a character from the cache.
+        """
+        with self._lock:
+            old = self._entries.pop((store.cache_key, name), None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self):
+        """
+        Empties the cache and resets its counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the cache's counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+
+def estimate_character_size(character):
+    """
+    Roughly estimates the memory a cached character copy takes, in bytes.
+    """
+    size = sys.getsizeof(character)
+    for value in character.values():
+        size += sys.getsizeof(value)
+    return size
+
+
+# Shared cache used by the save functions; replace it to change the bounds
+character_cache = CharacterCache()
+
+
+def fetch_character(store, character_name):
+    """
+    Loads a character from store, going through character_cache.
+    """
+    # Take the token before loading: if the save changes in between, the
+    # entry carries the older token and the next lookup reloads it
+    token = store.cache_token(character_name)
+    character = character_cache.get(store, character_name, token)
+    if character is None:
+        character = store.load_character(character_name)
+        character_cache.put(store, character, token)
+    return character
+
+
+def store_character(store, character, force=False):
+    """
+    Saves a character to store and updates character_cache to match.
+    """
+    # Clean characters are skipped by the store, and the save on disk may
+    # since have changed, so only a real write refreshes the cache
+    writes = force or is_dirty(character)
     try:
-        with open(filename, "r") as f:
-            lines = f.readlines()
-    except Exception:
-        raise SaveFileCorruptedError("Save file exists but could not be read")
+        result = store.save_character(character, force)
+    except BaseException:
+        character_cache.invalidate(store, character["name"])
+        raise
+    if writes:
+        character_cache.put(store, character, store.cache_token(character["name"]))
+    return result
+
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+def get_store(save_directory=None):
+    """
+    Returns the character store the save functions delegate to.
+
+    With no save_directory this is the store installed by set_store, or
+    the save files in DEFAULT_SAVE_DIRECTORY if none was installed. A
+    save_directory always means the save files in that directory.
+    """
+
+    if save_directory is None:
+        if _store is not None:
+            return _store
+        save_directory = DEFAULT_SAVE_DIRECTORY
+
+    store = _file_stores.get(save_directory)
+    if store is None:
+        store = character_storage.FileCharacterStore(save_directory)
+        _file_stores[save_directory] = store
+    return store
+
+
+def set_store(store):
+    """
+    Installs the default character store (any character_storage store),
+    or None to go back to save files. Returns the previous store.
+    """
+
+    global _store
+    previous = _store
+    _store = store
+    return previous
+
+
+def get_save_path(character_name, save_directory=DEFAULT_SAVE_DIRECTORY,
+                  save_format=TEXT_SAVE_FORMAT):
+    """
+    Returns the save file path for a character name.
+    """
+    return os.path.join(save_directory, character_name + SAVE_SUFFIXES[save_format])
+
+
+def format_save_data(character):
+    """
+    Returns the text of a character's save file.
+    """
+
+    lines = []
+    # Write each character field to the save file
+    for key, value in character.items():
+        # Convert lists into comma-separated strings
+        if isinstance(value, list):
+            value = ",".join(value)
+        lines.append(f"{key.upper()}: {value}\n")
+    return "".join(lines)
+
+
+def parse_save_data(text):
+    """
+    Parses the text of a save file into a validated character.
+    """
 
     character = {}
 
     try:
         # Parse each line of the save file
-        for line in lines:
+        for line in text.splitlines():
             if ":" not in line:
                 raise InvalidSaveDataError("Invalid line format in save file")
 
@@ -137,78 +563,508 @@ def load_character(character_name, save_directory="data/save_games"):
 
         # Validate data structure
         validate_character_data(character)
-        return character
+        return Character.from_dict(character, dirty=False)
 
     except Exception:
         raise InvalidSaveDataError("Save data is corrupted or incomplete")
 
 
-def list_saved_characters(save_directory="data/save_games"):
+def format_binary_save_data(character):
     """
-    Returns a list of saved character names (without file extensions).
+    Returns the bytes of a character's binary save file.
+
+    Numeric fields are packed with struct, and each inventory or quest ID
+    is stored once in a table that the lists index into. Fields outside
+    NUMERIC_FIELDS and LIST_FIELDS are stored as text, exactly as the text
+    format would read them back.
+    """
+
+    ids = {}
+    indexes = []
+    list_counts = []
+    for field in LIST_FIELDS:
+        values = character[field]
+        list_counts.append(len(values))
+        indexes.extend([ids.setdefault(item_id, len(ids)) for item_id in values])
+
+    strings = [character["name"], character["class"]]
+    strings.extend(ids)
+    extra_count = 0
+    for key, value in character.items():
+        if key not in _BINARY_FIELDS:
+            if isinstance(value, list):
+                value = ",".join(value)
+            strings.append(key.lower())
+            strings.append(str(value).strip())
+            extra_count += 1
+
+    text = "\0".join(strings).encode("utf-8")
+    fixed = _BINARY_V1_FIXED.pack(
+        BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION,
+        *[character[field] for field in NUMERIC_FIELDS],
+        len(ids), *list_counts, extra_count, len(text)
+    )
+    return fixed + struct.pack(f"<{len(indexes)}H", *indexes) + text
+
+
+def parse_binary_save_data(data):
     """
+    Parses the bytes of a binary save file into a validated character.
+    """
+
+    try:
+        magic, version = _BINARY_HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise InvalidSaveDataError("Save data is corrupted or incomplete")
+    if magic != BINARY_SAVE_MAGIC:
+        raise InvalidSaveDataError("Not a binary save file")
+
+    decoder = _BINARY_DECODERS.get(version)
+    if decoder is None:
+        raise InvalidSaveDataError(f"Unsupported save format version: {version}")
+
+    # The layout guarantees every required field and its type, so the
+    # decoded character needs no further validation
+    try:
+        character = decoder(data)
+    except Exception:
+        raise InvalidSaveDataError("Save data is corrupted or incomplete")
 
-    # If directory does not exist, return empty list
-    if not os.path.exists(save_directory):
-        return []
+    mark_clean(character)
+    return character
+
+
+def _decode_binary_v1(data):
+    (_, _, level, health, max_health, strength, magic, experience, gold,
+     id_count, inventory_count, active_count, completed_count, extra_count,
+     text_length) = _BINARY_V1_FIXED.unpack_from(data, 0)
 
-    characters = []
+    offset = _BINARY_V1_FIXED.size
+    index_count = inventory_count + active_count + completed_count
+    indexes = struct.unpack_from(f"<{index_count}H", data, offset)
+    offset += 2 * index_count
+    if offset + text_length != len(data):
+        raise InvalidSaveDataError("Save data has the wrong length")
+
+    strings = data[offset:].decode("utf-8").split("\0")
+    if len(strings) != 2 + id_count + 2 * extra_count:
+        raise InvalidSaveDataError("Save data has the wrong number of strings")
+    lookup = list(map(sys.intern, strings[2:2 + id_count])).__getitem__
+    completed_start = inventory_count + active_count
+
+    character = {
+        "name": strings[0],
+        "class": strings[1],
+        "level": level,
+        "health": health,
+        "max_health": max_health,
+        "strength": strength,
+        "magic": magic,
+        "experience": experience,
+        "gold": gold,
+        "inventory": list(map(lookup, indexes[:inventory_count])),
+        "active_quests": list(map(lookup, indexes[inventory_count:completed_start])),
+        "completed_quests": list(map(lookup, indexes[completed_start:]))
+    }
+    if extra_count:
+        extras = strings[2 + id_count:]
+        character.update(zip(extras[0::2], extras[1::2]))
+    return Character.from_dict(character, dirty=False)
 
-    # Look through save files and extract character names
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            characters.append(filename.replace("_save.txt", ""))
 
-    return characters
+# Decoders for each binary save version; older versions stay readable
+_BINARY_DECODERS = {1: _decode_binary_v1}
+_BINARY_FIELDS = frozenset(("name", "class") + NUMERIC_FIELDS + LIST_FIELDS)
 
 
-def delete_character(character_name, save_directory="data/save_games"):
+def migrate_text_save(text):
     """
-    Deletes a saved character file.
-    Throws an error if the file does not exist.
+    Converts the text of a text save into binary save bytes.
     """
+    return format_binary_save_data(parse_save_data(text))
 
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
 
-    # Must exist before deletion
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"No save exists for: {character_name}")
+def write_save_file(filename, text, fsync=DEFAULT_FSYNC_POLICY):
+    """
+    Writes a save file through a temp file and an atomic rename. text may
+    be str for a text save or bytes for a binary save.
+
+    File I/O errors propagate to the caller; the old save is left intact.
+    """
+
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+
+    # Ensure the save directory exists
+    save_directory = os.path.dirname(filename)
+    if save_directory and not os.path.exists(save_directory):
+        os.makedirs(save_directory, exist_ok=True)
+
+    # Each write gets its own temp file, so concurrent writers of the same
+    # save never share (and publish) each other's half-written data
+    fd, temp_path = tempfile.mkstemp(
+        dir=save_directory or ".", prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(text, bytes) else "w") as f:
+            f.write(text)
+            if fsync != FSYNC_NONE:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync == FSYNC_FULL and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(save_directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def copy_character(character):
+    """
+    Returns a plain dictionary copy of a character. Lists and dicts are
+    copied as well, so later changes to the character don't show through.
+    """
+
+    copy = {}
+    for key, value in character.items():
+        if isinstance(value, (list, dict)):
+            value = value.copy()
+        copy[key] = value
+    return copy
+
+
+def snapshot_character(character):
+    """
+    Returns a Character copy of a character that carries its tracked
+    changes (every field, for an untracked dict), so a store saving the
+    copy later, e.g. a journal, still knows what changed.
+    """
+    snapshot = Character.from_dict(copy_character(character))
+    if is_tracked(character):
+        snapshot.dirty_fields = character.dirty_fields
+    return snapshot
+
+
+class WriteBehindSaver:
+    """
+    Coalesces repeated saves of the same character.
+
+    save() takes a copy of the character, including which fields changed
+    (see snapshot_character), and returns at once; a background
+    thread hands it to the character store once the window has passed
+    since the first unwritten save. Later saves inside the window replace
+    the pending copy, so a burst of saves costs one write, and a save
+    identical to the last write is dropped. A window of 0 writes in the
+    caller's thread. Call flush() before relying on the saves and close()
+    when done; a failed background write is raised from the next save()
+    or flush().
+
+    Saves go to store if one is given. Otherwise they go to the save files
+    in save_directory when fsync is given, and to get_store(save_directory)
+    when it isn't.
+    """
+
+    def __init__(self, save_directory=None, window=DEFAULT_SAVE_WINDOW, fsync=None,
+                 store=None):
+        if store is None and fsync is not None:
+            store = character_storage.FileCharacterStore(
+                save_directory or DEFAULT_SAVE_DIRECTORY, fsync)
+
+        self.save_directory = save_directory
+        self.window = window
+        self.store = store
+        self._pending = {}    # name -> [character copy, due time]
+        self._written = {}    # name -> character copy last written
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()   # keeps writes in save order
+        self._thread = None
+        self._closed = False
+        self._error = None
+
+    def save(self, character):
+        """
+        Queues a save of character. Returns False if the save was dropped
+        because nothing changed since the last save or write.
+        """
+
+        if not is_dirty(character):
+            return False
+        snapshot = snapshot_character(character)
+        name = snapshot["name"]
+        with self._condition:
+            self._raise_error()
+            if self._closed:
+                raise RuntimeError("WriteBehindSaver is closed")
+            # Only clean once the changes are queued, so a refused save
+            # keeps them for the next attempt
+            mark_clean(character)
+
+            pending = self._pending.get(name)
+            if pending is not None:
+                # Keep the first save's deadline and the replaced save's changes
+                snapshot.mark_dirty(*pending[0].dirty_fields)
+                pending[0] = snapshot
+            elif self._written.get(name) == snapshot:
+                return False
+            else:
+                self._pending[name] = [snapshot, time.monotonic() + self.window]
+
+            if self.window > 0:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+                self._condition.notify()
+                return True
+
+        self.flush(name)
+        return True
+
+    def flush(self, name=None):
+        """
+        Writes pending saves now: one character's, or all of them.
+        """
+
+        with self._write_lock:
+            with self._condition:
+                if name is None:
+                    batch = self._pending
+                    self._pending = {}
+                else:
+                    batch = {}
+                    if name in self._pending:
+                        batch[name] = self._pending.pop(name)
+            self._write_batch(batch)
+
+        with self._condition:
+            self._raise_error()
+
+    def discard(self, name):
+        """
+        Drops a pending save and forgets what was written for name, e.g.
+        after the character's save is deleted.
+        """
+        with self._condition:
+            self._pending.pop(name, None)
+            self._written.pop(name, None)
+
+    def pending_names(self):
+        """
+        Returns the names of characters with unwritten saves.
+        """
+        with self._condition:
+            return list(self._pending)
+
+    def close(self):
+        """
+        Writes everything pending and stops the background thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        """
+        Background loop that writes saves as their windows expire.
+        """
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [d for _, d in self._pending.values()]
+                    if due and min(due) <= now:
+                        break
+                    self._condition.wait(min(due) - now if due else None)
+                if self._closed:
+                    return
+            self._flush_due()
+
+    def _flush_due(self):
+        with self._write_lock:
+            with self._condition:
+                now = time.monotonic()
+                batch = {}
+                for name, (text, due) in list(self._pending.items()):
+                    if due <= now:
+                        batch[name] = self._pending.pop(name)
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    # Retry after another window instead of spinning
+                    retry_at = time.monotonic() + self.window
+                    for entry in self._pending.values():
+                        entry[1] = max(entry[1], retry_at)
+
+    def _write_batch(self, batch):
+        """
+        Writes a batch of saves. If a write fails, it and the rest of the
+        batch go back to pending (unless a newer save is already queued).
+        """
+        store = self.store or get_store(self.save_directory)
+        names = list(batch)
+        for position, name in enumerate(names):
+            snapshot = batch[name][0]
+            try:
+                store_character(store, snapshot)
+            except Exception:
+                with self._condition:
+                    for unwritten in names[position:]:
+                        self._pending.setdefault(unwritten, batch[unwritten])
+                raise
+            with self._condition:
+                self._written[name] = snapshot
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+# ============================================================================
+# ASYNC PERSISTENCE
+# ============================================================================
+
+# Event loop -> its semaphore and per-character locks. asyncio primitives
+# belong to the loop that first uses them, so each loop gets its own.
+_async_states = weakref.WeakKeyDictionary()
+
+
+class _AsyncState:
+    def __init__(self, limit):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.locks = {}   # (store key, name) -> [asyncio.Lock, users]
+
+
+def _async_state():
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is None:
+        state = _async_states[loop] = _AsyncState(DEFAULT_ASYNC_IO_LIMIT)
+    return state
+
+
+async def _run_store_io(store, character_name, func, *args):
+    """
+    Runs a blocking store call in a worker thread, one at a time per
+    character and at most DEFAULT_ASYNC_IO_LIMIT at a time per loop.
+    """
+
+    state = _async_state()
+    key = (store.cache_key, character_name)
+    entry = state.locks.get(key)
+    if entry is None:
+        entry = state.locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            async with state.semaphore:
+                return await asyncio.to_thread(func, *args)
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del state.locks[key]
+
+
+async def async_save_character(character, save_directory=None, force=False):
+    """
+    Async version of save_character. The file I/O runs in a worker thread,
+    so the event loop is never blocked.
+
+    The character is copied as soon as the save starts, before its first
+    await, so it may keep changing while the save is in flight. Saves of
+    the same character are written one at a time, in the order they started.
+    """
+
+    store = get_store(save_directory)
+    snapshot = snapshot_character(character)
+    changed = None
+    if is_tracked(character):
+        changed = snapshot.dirty_fields
+        mark_clean(character)
+
+    try:
+        return await _run_store_io(store, snapshot["name"], store_character,
+                                   store, snapshot, force)
+    except BaseException:
+        if changed is not None:
+            mark_dirty(character, *changed)
+        raise
+
+
+async def async_load_character(character_name, save_directory=None):
+    """
+    Async version of load_character. The load runs in a worker thread
+    (checking a cache entry means looking at the save, too) and waits for
+    any save of the character still in flight.
+    """
+
+    store = get_store(save_directory)
+    return await _run_store_io(store, character_name, fetch_character,
+                               store, character_name)
+
+
+async def async_list_saved_characters(save_directory=None):
+    """
+    Async version of list_saved_characters.
+    """
+    store = get_store(save_directory)
+    async with _async_state().semaphore:
+        return await asyncio.to_thread(store.list_saved_characters)
 
-    os.remove(filename)
-    return True
 
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
 
-def gain_experience(character, xp_amount):
+def gain_experience(character, xp_amount, curve=None):
     """
     Add XP and handle leveling up.
     Characters cannot gain XP if dead.
+
+    Levels follow curve (progression.get_curve() by default). Any number
+    of level-ups is worked out with one lookup, and their stat gains are
+    added together.
     """
 
     # Dead characters cannot receive XP
     if character["health"] <= 0:
         raise CharacterDeadError("Character is dead and cannot gain XP")
 
-    # Add XP
-    character["experience"] += xp_amount
-    leveled_up = False
-
-    # Level up repeatedly if enough XP accumulates
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
+    if curve is None:
+        curve = progression.get_curve()
 
-        # Stat increases
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
+    # Add XP and find the level it reaches
+    level, experience = curve.resolve(character["level"], character["experience"] + xp_amount)
+    character["experience"] = experience
+    levels_gained = level - character["level"]
+    if levels_gained <= 0:
+        return False
 
-        leveled_up = True
+    # Stat increases for every level gained
+    character["level"] = level
+    for stat, gain in progression.LEVEL_UP_GAINS.items():
+        character[stat] += gain * levels_gained
+    character["health"] = character["max_health"]
 
-    return leveled_up
+    return True
 
 
 def add_gold(character, amount):
@@ -272,32 +1128,20 @@ def validate_character_data(character):
     and that values are correct types.
     """
 
-    # List of required keys for a valid character
-    required_fields = [
-        "name", "class", "level", "health", "max_health",
-        "strength", "magic", "experience", "gold",
-        "inventory", "active_quests", "completed_quests"
-    ]
+    # Every standard field is required, with the type Character gives it
+    field_types = Character.FIELD_TYPES
 
     # Check every required field is present
-    for field in required_fields:
+    for field in field_types:
         if field not in character:
             raise InvalidSaveDataError(f"Missing field: {field}")
 
-    # Check numeric fields are integers
-    numeric_fields = ["level", "health", "max_health", "strength",
-                      "magic", "experience", "gold"]
-
-    for field in numeric_fields:
-        if not isinstance(character[field], int):
-            raise InvalidSaveDataError(f"{field} must be an integer")
-
-    # Check list fields are lists
-    list_fields = ["inventory", "active_quests", "completed_quests"]
+    # Check each field has its type
+    type_names = {int: "an integer", list: "a list", str: "a string"}
 
-    for field in list_fields:
-        if not isinstance(character[field], list):
-            raise InvalidSaveDataError(f"{field} must be a list")
+    for field, field_type in field_types.items():
+        if not isinstance(character[field], field_type):
+            raise InvalidSaveDataError(f"{field} must be {type_names[field_type]}")
 
     return True
 
@@ -0,0 +1,312 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Population Module
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+This module stores many characters column by column for batch updates.
+"""
+
+from array import array
+from itertools import repeat
+from operator import add, sub
+import progression
+from character_manager import NUMERIC_FIELDS, copy_character
+from game_records import Character
+from custom_exceptions import CharacterDeadError
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; columns fall back to array("q")
+    numpy = None
+
+# ============================================================================
+# CHARACTER POPULATION
+# ============================================================================
+
+class CharacterPopulation:
+    """
+    Many characters stored as columns: one array per numeric field
+    (character_manager.NUMERIC_FIELDS), with row i holding character i.
+
+    World-tick jobs (regenerating health, event XP, daily gold) run over
+    whole columns at once instead of calling heal_character and friends
+    per character. Every operation takes an optional mask, a sequence
+    with one truthy/falsy value per row, to limit it to some characters;
+    is_character_dead returns such a mask.
+
+    Columns are NumPy int64 arrays when NumPy is installed (use_numpy=None
+    picks it automatically) and array("q") otherwise. Names, classes,
+    lists and extra fields are kept per row and only touched when
+    converting back to Character records.
+    """
+
+    def __init__(self, characters=(), use_numpy=None):
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed")
+        self.use_numpy = use_numpy
+
+        characters = list(characters)
+        self.names = [character["name"] for character in characters]
+        self._others = []   # row -> copy of the non-numeric fields
+        for character in characters:
+            other = copy_character(character)
+            for field in NUMERIC_FIELDS:
+                del other[field]
+            self._others.append(other)
+        self.columns = {
+            field: self._column([character[field] for character in characters])
+            for field in NUMERIC_FIELDS
+        }
+
+    @classmethod
+    def from_characters(cls, characters, use_numpy=None):
+        """
+        Builds a population from character records or dictionaries.
+        """
+        return cls(characters, use_numpy)
+
+    def to_characters(self):
+        """
+        Returns every row as a new Character, in row order.
+        """
+        return [self.character(row) for row in range(len(self))]
+
+    def character(self, row):
+        """
+        Returns one row as a new Character (all fields dirty, so it saves).
+        """
+        data = copy_character(self._others[row])
+        for field in NUMERIC_FIELDS:
+            data[field] = int(self.columns[field][row])
+        return Character.from_dict(data)
+
+    def set_character(self, row, character):
+        """
+        Overwrites one row with a character's current values.
+        """
+        other = copy_character(character)
+        for field in NUMERIC_FIELDS:
+            self.columns[field][row] = other.pop(field)
+        self.names[row] = other["name"]
+        self._others[row] = other
+
+    def row_of(self, name):
+        """
+        Returns the row holding the named character.
+        """
+        return self.names.index(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    # ------------------------------------------------------------------------
+    # Batch operations
+    # ------------------------------------------------------------------------
+
+    def heal_character(self, amount, mask=None):
+        """
+        Heals every (masked) character by amount, capped at max_health.
+        Returns how much each row was healed.
+        """
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+        mask = self._mask(mask)
+
+        if self.use_numpy:
+            healed = numpy.minimum(max_health, health + amount) - health
+            if mask is not None:
+                healed[~mask] = 0
+            health += healed
+            return healed
+
+        if mask is None:
+            new_health = array("q", map(min, max_health, map(add, health, repeat(amount))))
+        else:
+            new_health = array("q", [
+                min(top, current + amount) if selected else current
+                for top, current, selected in zip(max_health, health, mask)
+            ])
+        self.columns["health"] = new_health
+        return array("q", map(sub, new_health, health))
+
+    def add_gold(self, amount, mask=None):
+        """
+        Adds amount of gold to every (masked) character. Raises ValueError,
+        changing nothing, if any total would go below zero. Returns the
+        gold column.
+        """
+        gold = self.columns["gold"]
+        mask = self._mask(mask)
+
+        if self.use_numpy:
+            change = numpy.full(len(self), amount, dtype=numpy.int64)
+            if mask is not None:
+                change[~mask] = 0
+            if (gold + change < 0).any():
+                raise ValueError("Gold cannot go below zero")
+            gold += change
+            return gold
+
+        if mask is None:
+            new_gold = array("q", map(add, gold, repeat(amount)))
+        else:
+            new_gold = array("q", [
+                total + amount if selected else total
+                for total, selected in zip(gold, mask)
+            ])
+        if new_gold and min(new_gold) < 0:
+            raise ValueError("Gold cannot go below zero")
+        self.columns["gold"] = new_gold
+        return new_gold
+
+    def gain_experience(self, xp_amount, mask=None, curve=None):
+        """
+        Adds XP to every (masked) character, applying level-ups and their
+        stat gains as gain_experience does. Raises CharacterDeadError,
+        changing nothing, if any of them is dead. Returns which rows
+        leveled up.
+        """
+        if curve is None:
+            curve = progression.get_curve()
+        mask = self._mask(mask)
+        dead = self.is_character_dead(mask)
+        if any(dead):
+            name = self.names[list(dead).index(True)]
+            raise CharacterDeadError(f"Character is dead and cannot gain XP: {name}")
+
+        if self.use_numpy:
+            gained = self._resolve_levels_numpy(xp_amount, mask, curve)
+        else:
+            gained = self._resolve_levels(xp_amount, mask, curve)
+
+        # Stat increases for every level gained
+        columns = self.columns
+        if self.use_numpy:
+            leveled = gained > 0
+            columns["level"] += gained
+            for stat, gain in progression.LEVEL_UP_GAINS.items():
+                columns[stat] += gain * gained
+            columns["health"][leveled] = columns["max_health"][leveled]
+            return leveled
+
+        leveled = [levels > 0 for levels in gained]
+        columns["level"] = array("q", map(add, columns["level"], gained))
+        for stat, gain in progression.LEVEL_UP_GAINS.items():
+            columns[stat] = array("q", [
+                value + gain * levels for value, levels in zip(columns[stat], gained)
+            ])
+        columns["health"] = array("q", [
+            top if up else current
+            for top, current, up in zip(columns["max_health"], columns["health"], leveled)
+        ])
+        return leveled
+
+    def is_character_dead(self, mask=None):
+        """
+        Returns which (masked) rows are dead (health <= 0).
+        """
+        health = self.columns["health"]
+        mask = self._mask(mask)
+
+        if self.use_numpy:
+            dead = health <= 0
+            return dead if mask is None else dead & mask
+
+        if mask is None:
+            return [current <= 0 for current in health]
+        return [current <= 0 and selected for current, selected in zip(health, mask)]
+
+    # ------------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------------
+
+    def _column(self, values):
+        if self.use_numpy:
+            return numpy.array(values, dtype=numpy.int64)
+        return array("q", values)
+
+    def _mask(self, mask):
+        """
+        Returns mask as a NumPy bool array or list of bools (None = all rows).
+        """
+        if mask is None:
+            return None
+        if self.use_numpy:
+            mask = numpy.asarray(mask, dtype=bool)
+        else:
+            mask = [bool(selected) for selected in mask]
+        if len(mask) != len(self):
+            raise ValueError(f"Mask has {len(mask)} rows, population has {len(self)}")
+        return mask
+
+    def _resolve_levels(self, xp_amount, mask, curve):
+        """
+        Adds XP row by row with curve.resolve. Returns levels gained per row.
+        """
+        levels = self.columns["level"]
+        experience = self.columns["experience"]
+        if mask is None:
+            mask = repeat(True)
+
+        # Most grants don't reach the next level; check that against the
+        # running totals and only resolve the rows that do (or that sit
+        # past the totals, which stop at PRECOMPUTED_LEVELS unless the
+        # curve has already gone further)
+        top = min(max(levels, default=0) + 1, progression.PRECOMPUTED_LEVELS)
+        cumulative = curve.cumulative_xp(top)
+        known_levels = len(cumulative)
+
+        new_experience = array("q")
+        gained = []
+        for level, current, selected in zip(levels, experience, mask):
+            levels_gained = 0
+            if selected:
+                current += xp_amount
+                if level >= known_levels or cumulative[level - 1] + current >= cumulative[level]:
+                    new_level, current = curve.resolve(level, current)
+                    levels_gained = new_level - level
+            gained.append(levels_gained)
+            new_experience.append(current)
+        self.columns["experience"] = new_experience
+        return gained
+
+    def _resolve_levels_numpy(self, xp_amount, mask, curve):
+        """
+        Adds XP to all rows with one search of the curve's running totals;
+        rows that end up past the totals are resolved one by one. Returns
+        levels gained per row.
+        """
+        levels = self.columns["level"]
+        experience = self.columns["experience"]
+        selected = numpy.ones(len(self), dtype=bool) if mask is None else mask
+        new_experience = numpy.where(selected, experience + xp_amount, experience)
+
+        top = min(int(levels.max(initial=0)) + 1, progression.PRECOMPUTED_LEVELS)
+        cumulative = numpy.array(curve.cumulative_xp(top), dtype=numpy.int64)
+        complete = curve.max_level is not None and len(cumulative) >= curve.max_level
+
+        # Rows left out may sit past the totals; look them up as level 1
+        searched = selected & (levels < len(cumulative))
+        totals = cumulative[numpy.where(searched, levels, 1) - 1] + new_experience
+        if not complete:
+            searched &= totals < cumulative[-1]
+
+        new_levels = numpy.searchsorted(cumulative, totals, side="right")
+        gained = numpy.where(searched & (new_levels > levels), new_levels - levels, 0)
+        leveled = gained > 0
+        new_experience[leveled] = totals[leveled] - cumulative[new_levels[leveled] - 1]
+
+        for row in numpy.flatnonzero(selected & ~searched):
+            level, new_experience[row] = curve.resolve(int(levels[row]), int(new_experience[row]))
+            gained[row] = level - levels[row]
+
+        # XP stops at the curve's last level
+        if curve.max_level is not None:
+            new_experience[selected & (levels + gained >= curve.max_level)] = 0
+        self.columns["experience"] = new_experience
+        return gained
@@ -0,0 +1,943 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Storage Module
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+This module provides storage backends for saved characters.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+import character_manager
+from game_records import Character
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+DEFAULT_DATABASE = "data/save_games/characters.db"
+
+# ============================================================================
+# STORE INTERFACE
+# ============================================================================
+
+class CharacterStore(ABC):
+    """
+    Interface every character storage backend implements.
+
+    character_manager's save_character, load_character,
+    list_saved_characters and delete_character delegate to a store (see
+    character_manager.get_store and set_store). Stores raise
+    CharacterNotFoundError for unknown names, and loads return validated
+    characters with no tracked changes.
+    """
+
+    @abstractmethod
+    def save_character(self, character, force=False):
+        """
+        Saves a character, replacing any earlier save with the same name.
+        A character with no tracked changes whose save exists is skipped
+        unless force is True. Returns True.
+        """
+
+    @abstractmethod
+    def load_character(self, character_name):
+        """
+        Loads and validates a character.
+        """
+
+    @abstractmethod
+    def list_saved_characters(self):
+        """
+        Returns the names of all saved characters.
+        """
+
+    @abstractmethod
+    def delete_character(self, character_name):
+        """
+        Deletes a saved character. Returns True.
+        """
+
+    def character_summaries(self):
+        """
+        Returns a summary (see character_summary) of every saved character.
+        This default loads each one; stores that keep the summary fields
+        separately override it.
+        """
+        summaries = []
+        for name in self.list_saved_characters():
+            try:
+                summaries.append(character_summary(self.load_character(name)))
+            except CharacterNotFoundError:
+                continue   # deleted since it was listed
+        return summaries
+
+    @property
+    def cache_key(self):
+        """
+        Identifies where the store keeps its saves, so that
+        character_manager.character_cache treats two stores over the same
+        files as one.
+        """
+        return self
+
+    def cache_token(self, character_name):
+        """
+        Returns a cheap value that changes whenever the character's save
+        does, however it was changed; character_manager.character_cache
+        drops entries whose token no longer matches. The default, None,
+        suits stores that can only be changed through this object.
+        """
+        return None
+
+    def close(self):
+        """
+        Releases anything the store holds open.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def character_summary(character, mtime=None, size=None):
+    """
+    Returns the fields listings need from a character: name, class, level
+    and gold, plus the modification time and size of its save where the
+    store has files.
+    """
+    return {
+        "name": character["name"],
+        "class": character["class"],
+        "level": character["level"],
+        "gold": character["gold"],
+        "mtime": mtime,
+        "size": size
+    }
+
+
+# ============================================================================
+# FILE STORE
+# ============================================================================
+
+# Manifest of a save directory, kept next to the saves; the leading "_"
+# keeps it apart from character names
+MANIFEST_FILENAME = "_manifest.jsonl"
+
+# Superseded manifest lines allowed, as a multiple of the entries, before
+# the manifest is rewritten
+MANIFEST_COMPACT_RATIO = 2
+
+
+class SaveManifest:
+    """
+    Summaries (see character_summary) of every save in a directory, so
+    listings can page, filter and sort characters without opening each
+    save.
+
+    The file holds one JSON line per change: a summary when a character is
+    saved and {"name": name, "deleted": true} when it is deleted. Later
+    lines win, so each save or delete is a small append. Once superseded
+    lines outnumber live ones MANIFEST_COMPACT_RATIO times over, the file
+    is rewritten with one line per character.
+
+    The manifest is derived data and is not fsynced. A crash can leave it
+    behind the saves (or with a torn last line, which is cut off when the
+    manifest is next read); rebuild regenerates it from the saves
+    themselves. If the file is missing (a
+    new directory, or saves from before manifests existed) it is rebuilt
+    the first time summaries are read. Saves and deletes leave a missing
+    manifest alone, so a single save never has to read every other save.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.save_directory = store.save_directory
+        self.path = os.path.join(self.save_directory, MANIFEST_FILENAME)
+        self._entries = None   # name -> summary, loaded on first use
+        self._lines = 0
+        self._stamp = None     # (mtime_ns, size) of the file as last seen
+        self._lock = threading.Lock()
+
+    def summaries(self):
+        """
+        Returns the summary of every character in the manifest.
+        """
+        with self._lock:
+            if not self._load():
+                self._rebuild()
+            return list(self._entries.values())
+
+    def record(self, name, filename, character):
+        """
+        Records that character was saved to filename.
+        """
+        stat = os.stat(filename)
+        with self._lock:
+            if not self._load():
+                return   # summaries() builds it, this save included
+            summary = character_summary(character, stat.st_mtime, stat.st_size)
+            self._entries[name] = summary
+            self._append(summary)
+
+    def remove(self, name):
+        """
+        Records that a character's save was deleted.
+        """
+        with self._lock:
+            if not self._load():
+                return
+            if self._entries.pop(name, None) is None:
+                return
+            if self._entries:
+                self._append({"name": name, "deleted": True})
+            else:
+                # Nothing left to describe; an empty directory rebuilds for free
+                os.remove(self.path)
+                self._stamp = None
+
+    def rebuild(self):
+        """
+        Regenerates the manifest by reading every save in the directory.
+        Returns a dictionary with the "indexed" count and the names of
+        saves that "failed" to load.
+        """
+        with self._lock:
+            return self._rebuild()
+
+    def _load(self):
+        """
+        Reads the manifest if it changed on disk since it was last seen.
+        Returns False if there is no manifest file.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._entries = {}
+            self._lines = 0
+            self._stamp = None
+            return False
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp and self._entries is not None:
+            return True
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # A last line without its newline was torn by a crash; cut it off
+        # so the next append starts on a line of its own
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+        entries = {}
+        lines = 0
+        for line in data[:end].decode("utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue   # damaged line; rebuild replaces it
+            lines += 1
+            if record.get("deleted"):
+                entries.pop(record["name"], None)
+            else:
+                entries[record["name"]] = record
+        self._entries = entries
+        self._lines = lines
+        self._stamp = stamp
+        return True
+
+    def _append(self, record):
+        if self._lines >= max(len(self._entries), 1) * (MANIFEST_COMPACT_RATIO + 1):
+            self._write()
+            return
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._lines += 1
+        self._remember_stamp()
+
+    def _write(self):
+        """
+        Rewrites the manifest with one line per character.
+        """
+        text = "".join(json.dumps(summary, separators=(",", ":")) + "\n"
+                       for summary in self._entries.values())
+        character_manager.write_save_file(self.path, text, character_manager.FSYNC_NONE)
+        self._lines = len(self._entries)
+        self._remember_stamp()
+
+    def _remember_stamp(self):
+        stat = os.stat(self.path)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def _rebuild(self):
+        entries = {}
+        failed = []
+        for name in self.store.list_saved_characters():
+            try:
+                character, filename = self.store.load_with_filename(name)
+                stat = os.stat(filename)
+            except (CharacterNotFoundError, FileNotFoundError):
+                continue   # deleted while rebuilding
+            except Exception:
+                failed.append(name)
+                continue
+            entries[name] = character_summary(character, stat.st_mtime, stat.st_size)
+
+        self._entries = entries
+        if os.path.isdir(self.save_directory):
+            self._write()
+        return {"indexed": len(entries), "failed": failed}
+
+
+class FileCharacterStore(CharacterStore):
+    """
+    Saves each character as "<name>_save.txt" in a directory, or as
+    "<name>_save.bin" with save_format=BINARY_SAVE_FORMAT.
+
+    Files are replaced atomically; fsync is one of
+    character_manager.FSYNC_POLICIES (None means the default policy).
+    Saves in the other format are still loaded, and the first save of a
+    character in this store's format replaces its old file.
+    """
+
+    def __init__(self, save_directory="data/save_games", fsync=None, save_format=None):
+        if fsync is None:
+            fsync = character_manager.DEFAULT_FSYNC_POLICY
+        if fsync not in character_manager.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        if save_format is None:
+            save_format = character_manager.TEXT_SAVE_FORMAT
+        if save_format not in character_manager.SAVE_FORMATS:
+            raise ValueError(f"Unknown save format: {save_format}")
+
+        self.save_directory = save_directory
+        self.fsync = fsync
+        self.save_format = save_format
+        self.manifest = SaveManifest(self)
+        # Formats to look for when loading, this store's own first
+        self._formats = (save_format,) + tuple(
+            f for f in character_manager.SAVE_FORMATS if f != save_format)
+
+    @property
+    def cache_key(self):
+        return ("files", os.path.abspath(self.save_directory))
+
+    def cache_token(self, character_name):
+        # Saves are replaced through a new file, so the inode changes even
+        # when a rewrite keeps the size and lands in the same mtime tick
+        for save_format in self._formats:
+            filename = character_manager.get_save_path(
+                character_name, self.save_directory, save_format)
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                continue
+            return (save_format, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return None
+
+    def save_character(self, character, force=False):
+        name = character["name"]
+        filename = character_manager.get_save_path(name, self.save_directory, self.save_format)
+        if not force and not character_manager.is_dirty(character) and os.path.exists(filename):
+            return True
+
+        if self.save_format == character_manager.BINARY_SAVE_FORMAT:
+            data = character_manager.format_binary_save_data(character)
+        else:
+            data = character_manager.format_save_data(character)
+        character_manager.write_save_file(filename, data, self.fsync)
+        character_manager.mark_clean(character)
+
+        # Drop the save in the other format so only the new one is loaded
+        for save_format in self._formats[1:]:
+            old_file = character_manager.get_save_path(name, self.save_directory, save_format)
+            if os.path.exists(old_file):
+                os.remove(old_file)
+
+        self.manifest.record(name, filename, character)
+        return True
+
+    def load_character(self, character_name):
+        return self.load_with_filename(character_name)[0]
+
+    def load_with_filename(self, character_name):
+        """
+        Loads a character; returns it with the save file it came from.
+        """
+        # Opening directly (rather than checking os.path.exists first)
+        # saves a stat call per load
+        for save_format in self._formats:
+            binary = save_format == character_manager.BINARY_SAVE_FORMAT
+            filename = character_manager.get_save_path(
+                character_name, self.save_directory, save_format)
+            try:
+                with open(filename, "rb" if binary else "r") as f:
+                    data = f.read()
+                break
+            except FileNotFoundError:
+                continue
+            except Exception:
+                raise SaveFileCorruptedError("Save file exists but could not be read")
+        else:
+            # Save file must exist
+            raise CharacterNotFoundError(f"No save found for: {character_name}")
+
+        if binary:
+            return character_manager.parse_binary_save_data(data), filename
+        return character_manager.parse_save_data(data), filename
+
+    def list_saved_characters(self):
+        # If directory does not exist, return empty list
+        if not os.path.exists(self.save_directory):
+            return []
+
+        characters = {}
+
+        # Look through save files and extract character names
+        suffixes = tuple(character_manager.SAVE_SUFFIXES.values())
+        for filename in os.listdir(self.save_directory):
+            if filename.endswith(suffixes):
+                characters[filename.rsplit("_save.", 1)[0]] = None
+
+        return list(characters)
+
+    def delete_character(self, character_name):
+        deleted = False
+        for save_format in self._formats:
+            filename = character_manager.get_save_path(
+                character_name, self.save_directory, save_format)
+            if os.path.exists(filename):
+                os.remove(filename)
+                deleted = True
+
+        # Must exist before deletion
+        if not deleted:
+            raise CharacterNotFoundError(f"No save exists for: {character_name}")
+        self.manifest.remove(character_name)
+        return True
+
+    def character_summaries(self):
+        return self.manifest.summaries()
+
+    def rebuild_manifest(self):
+        """
+        Regenerates the manifest from the saves on disk (see
+        SaveManifest.rebuild).
+        """
+        return self.manifest.rebuild()
+
+    def migrate_to_binary(self):
+        """
+        Converts every text save in the directory to a binary save and
+        removes the text file. Saves that can't be parsed are left alone.
+
+        Returns a dictionary with the "migrated" count and "failed" names.
+        """
+        migrated = 0
+        failed = []
+        for name in self.list_saved_characters():
+            text_file = character_manager.get_save_path(name, self.save_directory)
+            if not os.path.exists(text_file):
+                continue
+            try:
+                with open(text_file, "r") as f:
+                    character = character_manager.parse_save_data(f.read())
+                data = character_manager.format_binary_save_data(character)
+            except Exception:
+                failed.append(name)
+                continue
+            binary_file = character_manager.get_save_path(
+                name, self.save_directory, character_manager.BINARY_SAVE_FORMAT)
+            character_manager.write_save_file(binary_file, data, self.fsync)
+            os.remove(text_file)
+            self.manifest.record(name, binary_file, character)
+            migrated += 1
+        return {"migrated": migrated, "failed": failed}
+
+
+# ============================================================================
+# MEMORY STORE
+# ============================================================================
+
+class MemoryCharacterStore(CharacterStore):
+    """
+    Keeps saved characters in a dictionary; nothing touches the disk.
+
+    Meant for simulations, load tests and unit tests. Saves and loads
+    copy the character, so a loaded character is independent of the
+    stored one just as with files.
+    """
+
+    def __init__(self):
+        self._characters = {}   # name -> character copy
+        self._lock = threading.Lock()
+
+    def save_character(self, character, force=False):
+        name = character["name"]
+        if not force and not character_manager.is_dirty(character) and name in self._characters:
+            return True
+
+        character_manager.validate_character_data(character)
+        snapshot = character_manager.copy_character(character)
+        with self._lock:
+            self._characters[name] = snapshot
+        character_manager.mark_clean(character)
+        return True
+
+    def load_character(self, character_name):
+        with self._lock:
+            snapshot = self._characters.get(character_name)
+        if snapshot is None:
+            raise CharacterNotFoundError(f"No save found for: {character_name}")
+
+        return Character.from_dict(character_manager.copy_character(snapshot), dirty=False)
+
+    def list_saved_characters(self):
+        with self._lock:
+            return list(self._characters)
+
+    def delete_character(self, character_name):
+        with self._lock:
+            if self._characters.pop(character_name, None) is None:
+                raise CharacterNotFoundError(f"No save exists for: {character_name}")
+        return True
+
+# ============================================================================
+# JOURNAL STORE
+# ============================================================================
+
+# Journal records written before a store compacts the journal
+DEFAULT_COMPACT_AFTER = 100
+
+
+class JournalCharacterStore(CharacterStore):
+    """
+    Saves characters as a snapshot plus an append-only journal of changes.
+
+    "<name>.snap" is a binary save (see
+    character_manager.format_binary_save_data) and "<name>.journal" holds
+    one JSON line per save with the fields that changed since the last
+    save ({"set": {field: value}, "del": [field]}), taken from the
+    character's dirty tracking. A save is a small append instead of a
+    whole-file rewrite. Loads replay the journal over the snapshot; once a
+    journal holds compact_after records, the next save writes a fresh
+    snapshot and starts an empty journal.
+
+    The first journal line names a hash of the snapshot it extends, so a
+    crash between writing a new snapshot and resetting the journal leaves
+    a journal that is simply ignored. A torn last line from a crash during
+    an append is dropped. Untracked (plain dict) characters and forced
+    saves always write a full snapshot.
+    """
+
+    def __init__(self, save_directory="data/save_games/journal", fsync=None,
+                 compact_after=DEFAULT_COMPACT_AFTER):
+        if fsync is None:
+            fsync = character_manager.DEFAULT_FSYNC_POLICY
+        if fsync not in character_manager.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.save_directory = save_directory
+        self.fsync = fsync
+        self.compact_after = compact_after
+        self._journal_lengths = {}   # name -> records in the journal
+        self._lock = threading.Lock()
+
+    @property
+    def cache_key(self):
+        return ("journal", os.path.abspath(self.save_directory))
+
+    def cache_token(self, character_name):
+        token = []
+        for suffix in (".snap", ".journal"):
+            try:
+                stat = os.stat(self._path(character_name, suffix))
+            except FileNotFoundError:
+                token.append(None)
+                continue
+            token.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return tuple(token)
+
+    def save_character(self, character, force=False):
+        name = character["name"]
+        snapshot_path = self._path(name, ".snap")
+        with self._lock:
+            exists = os.path.exists(snapshot_path)
+            if not force and exists and not character_manager.is_dirty(character):
+                return True
+
+            tracked = character_manager.is_tracked(character)
+            if force or not exists or not tracked:
+                self._write_snapshot(character)
+            elif self._journal_length(name) >= self.compact_after:
+                self._write_snapshot(character)
+            else:
+                self._append(name, character)
+        character_manager.mark_clean(character)
+        return True
+
+    def load_character(self, character_name):
+        with self._lock:
+            character, length = self._replay(character_name)
+            self._journal_lengths[character_name] = length
+        return character
+
+    def list_saved_characters(self):
+        # If directory does not exist, return empty list
+        if not os.path.exists(self.save_directory):
+            return []
+
+        return [filename[:-len(".snap")] for filename in os.listdir(self.save_directory)
+                if filename.endswith(".snap")]
+
+    def delete_character(self, character_name):
+        snapshot_path = self._path(character_name, ".snap")
+        with self._lock:
+            if not os.path.exists(snapshot_path):
+                raise CharacterNotFoundError(f"No save exists for: {character_name}")
+            os.remove(snapshot_path)
+            journal_path = self._path(character_name, ".journal")
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            self._journal_lengths.pop(character_name, None)
+        return True
+
+    def compact(self, character_name):
+        """
+        Folds a character's journal into a new snapshot.
+        """
+        with self._lock:
+            character, _ = self._replay(character_name)
+            self._write_snapshot(character)
+
+    def journal_length(self, character_name):
+        """
+        Returns how many records a character's journal holds.
+        """
+        with self._lock:
+            return self._journal_length(character_name)
+
+    def _path(self, name, suffix):
+        return os.path.join(self.save_directory, name + suffix)
+
+    def _write_snapshot(self, character):
+        """
+        Writes a full snapshot, then a journal that starts from it.
+        """
+        name = character["name"]
+        data = character_manager.format_binary_save_data(character)
+        character_manager.write_save_file(self._path(name, ".snap"), data, self.fsync)
+        self._reset_journal(name, data)
+
+    def _reset_journal(self, name, snapshot_data):
+        """
+        Starts an empty journal on top of the given snapshot bytes.
+        """
+        header = json.dumps({"snapshot": hashlib.sha1(snapshot_data).hexdigest()}) + "\n"
+        character_manager.write_save_file(self._path(name, ".journal"), header, self.fsync)
+        self._journal_lengths[name] = 0
+
+    def _append(self, name, character):
+        """
+        Appends the character's changed fields to its journal.
+        """
+        changes = {}
+        removed = []
+        for field in character.dirty_fields:
+            if field in character:
+                changes[field] = journal_value(character[field])
+            else:
+                removed.append(field)
+        record = {"set": changes}
+        if removed:
+            record["del"] = removed
+
+        length = self._journal_length(name)
+        with open(self._path(name, ".journal"), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            if self.fsync != character_manager.FSYNC_NONE:
+                f.flush()
+                os.fsync(f.fileno())
+        self._journal_lengths[name] = length + 1
+
+    def _journal_length(self, name):
+        length = self._journal_lengths.get(name)
+        if length is None:
+            _, length = self._replay(name)
+            self._journal_lengths[name] = length
+        return length
+
+    def _replay(self, name):
+        """
+        Rebuilds a character from its snapshot and journal. Returns the
+        character and the number of journal records applied.
+        """
+        try:
+            with open(self._path(name, ".snap"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f"No save found for: {name}")
+        except Exception:
+            raise SaveFileCorruptedError("Save file exists but could not be read")
+
+        character = character_manager.parse_binary_save_data(data)
+        lines = self._read_journal(name)
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            raise InvalidSaveDataError("Save data is corrupted or incomplete")
+
+        if header.get("snapshot") != hashlib.sha1(data).hexdigest():
+            # Missing journal, or one of an older snapshot whose changes
+            # are already in this one; start over so appends are seen
+            self._reset_journal(name, data)
+            return character, 0
+
+        try:
+            for line in lines[1:]:
+                record = json.loads(line)
+                character.update(record["set"])
+                for field in record.get("del", ()):
+                    character.pop(field, None)
+            character_manager.validate_character_data(character)
+        except Exception:
+            raise InvalidSaveDataError("Save data is corrupted or incomplete")
+
+        character_manager.mark_clean(character)
+        return character, len(lines) - 1
+
+    def _read_journal(self, name):
+        """
+        Returns a journal's complete lines. A torn last line, left by a
+        crash during an append, is cut off so later appends start clean.
+        """
+        path = self._path(name, ".journal")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        return data[:end].decode("utf-8").splitlines()
+
+
+def journal_value(value):
+    """
+    Converts a field value to what a load would read back: numbers,
+    strings and lists of IDs as they are, anything else as text.
+    """
+    if isinstance(value, (int, str)):
+        return value
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return str(value).strip()
+
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache compiles each of them once and reuses it on every call
+SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS characters (
+        name TEXT PRIMARY KEY,
+        class TEXT NOT NULL,
+        level INTEGER NOT NULL,
+        gold INTEGER NOT NULL,
+        data TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS characters_by_level ON characters (level)",
+)
+SQL_UPSERT = "INSERT OR REPLACE INTO characters (name, class, level, gold, data) VALUES (?, ?, ?, ?, ?)"
+SQL_SELECT = "SELECT data FROM characters WHERE name = ?"
+SQL_EXISTS = "SELECT 1 FROM characters WHERE name = ?"
+SQL_NAMES = "SELECT name FROM characters ORDER BY name"
+SQL_SUMMARIES = "SELECT name, class, level, gold, length(data) FROM characters ORDER BY name"
+SQL_DELETE = "DELETE FROM characters WHERE name = ?"
+
+
+class SQLiteCharacterStore(CharacterStore):
+    """
+    Saves characters as rows of one SQLite database.
+
+    Each row holds the character's save text plus its name (the primary
+    key), class, level and gold, so lookups by name are index seeks and
+    listings never parse saves. The database runs in WAL mode, so readers
+    don't block the writer. One store can be shared between threads.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE, synchronous="NORMAL"):
+        """
+        Open (creating if needed) the database at path.
+
+        synchronous is SQLite's durability setting: "NORMAL" is safe from
+        corruption in WAL mode; "FULL" also survives power loss.
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly where needed
+        self._connection = sqlite3.connect(path, check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        for statement in SQLITE_SCHEMA:
+            self._connection.execute(statement)
+
+    @property
+    def cache_key(self):
+        return ("sqlite", os.path.abspath(self.path))
+
+    def cache_token(self, character_name):
+        # data_version changes when another connection commits; it is only
+        # comparable on one connection, hence the connection in the token.
+        # Writes through this store are either cached as they happen or
+        # invalidated by hand (import_text_saves)
+        with self._lock:
+            (version,) = self._connection.execute("PRAGMA data_version").fetchone()
+        return (id(self._connection), version)
+
+    def save_character(self, character, force=False):
+        """
+        Saves a character, replacing any row with the same name.
+
+        Like character_manager.save_character, a character with no tracked
+        changes whose row exists is not rewritten unless force is True.
+        """
+        name = character["name"]
+        with self._lock:
+            if not force and not character_manager.is_dirty(character):
+                if self._connection.execute(SQL_EXISTS, (name,)).fetchone():
+                    return True
+            self._connection.execute(SQL_UPSERT, self._row(character))
+        character_manager.mark_clean(character)
+        return True
+
+    def load_character(self, character_name):
+        """
+        Loads and validates a character.
+        """
+        with self._lock:
+            row = self._connection.execute(SQL_SELECT, (character_name,)).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"No save found for: {character_name}")
+        return character_manager.parse_save_data(row[0])
+
+    def list_saved_characters(self):
+        """
+        Returns the names of all saved characters, sorted.
+        """
+        with self._lock:
+            return [name for (name,) in self._connection.execute(SQL_NAMES)]
+
+    def character_summaries(self):
+        """
+        Returns the summary of every character from the indexed columns,
+        without parsing any saves; "size" is the length of the save text.
+        """
+        with self._lock:
+            rows = self._connection.execute(SQL_SUMMARIES).fetchall()
+        return [
+            {"name": name, "class": character_class, "level": level, "gold": gold,
+             "mtime": None, "size": size}
+            for name, character_class, level, gold, size in rows
+        ]
+
+    def delete_character(self, character_name):
+        """
+        Deletes a saved character.
+        """
+        with self._lock:
+            cursor = self._connection.execute(SQL_DELETE, (character_name,))
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"No save exists for: {character_name}")
+        return True
+
+    def import_text_saves(self, save_directory="data/save_games", batch_size=1000):
+        """
+        Copies every "<name>_save.txt" file in save_directory into the
+        database, batch_size rows per transaction.
+
+        Files that can't be read or parsed are skipped. Returns a
+        dictionary with the "imported" count and the "failed" names.
+        """
+        # Read the files directly: going through character_manager would
+        # fill the shared character cache with every imported save
+        source = FileCharacterStore(save_directory)
+        imported = 0
+        failed = []
+        batch = []
+        for name in source.list_saved_characters():
+            try:
+                character = source.load_character(name)
+            except Exception:
+                failed.append(name)
+                continue
+            batch.append(self._row(character))
+            if len(batch) >= batch_size:
+                imported += self._import_batch(batch)
+                batch = []
+        if batch:
+            imported += self._import_batch(batch)
+        return {"imported": imported, "failed": failed}
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _import_batch(self, rows):
+        """
+        Writes imported rows, then drops their cached copies: these writes
+        bypass character_manager.store_character.
+        """
+        count = self._write_batch(rows)
+        for row in rows:
+            character_manager.character_cache.invalidate(self, row[0])
+        return count
+
+    def _write_batch(self, rows):
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(SQL_UPSERT, rows)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return len(rows)
+
+    @staticmethod
+    def _row(character):
+        return (
+            character["name"],
+            character["class"],
+            character["level"],
+            character["gold"],
+            character_manager.format_save_data(character),
+        )
@@ -0,0 +1,72 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Data Conversion Tool
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+Converts quest and item files between the text and JSON Lines formats.
+
+Usage:
+    python convert_data.py data/quests.txt data/quests.jsonl
+    python convert_data.py data/items.jsonl data/items.txt --kind items
+"""
+
+import argparse
+import os
+import sys
+
+import game_data
+from custom_exceptions import DataError
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+
+def guess_kind(filename):
+    """
+    Guesses whether a file holds quests or items from its name.
+    Returns None if the name does not say.
+    """
+
+    name = os.path.basename(filename).lower()
+    if "quest" in name:
+        return "quests"
+    if "item" in name:
+        return "items"
+    return None
+
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns a process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Convert quest/item data between text and JSON Lines."
+    )
+    parser.add_argument("source", help="file to read (.txt or .jsonl)")
+    parser.add_argument("destination", help="file to write; the extension picks the format")
+    parser.add_argument("--kind", choices=["quests", "items"],
+                        help="record type (guessed from the file name if omitted)")
+    args = parser.parse_args(argv)
+
+    kind = args.kind or guess_kind(args.source)
+    if kind is None:
+        parser.error("cannot tell quests from items by the file name; pass --kind")
+
+    compiled = game_data.QUEST_PARSER if kind == "quests" else game_data.ITEM_PARSER
+
+    try:
+        count = game_data.convert_data_file(args.source, args.destination, compiled)
+    except DataError as e:
+        print(f"Conversion failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {count} {kind} to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,6 +50,10 @@ class CorruptedDataError(DataError):
     """Raised when data file is corrupted or unreadable"""
     pass
 
+class DuplicateRecordError(DataError):
+    """Raised when the same record ID appears more than once in loaded data"""
+    pass
+
 # Character Exceptions
 class InvalidCharacterClassError(CharacterError):
     """Raised when an invalid character class is specified"""
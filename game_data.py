@@ -10,23 +10,52 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import json
+import hashlib
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from game_records import Quest, Item, ItemEffect, NO_EFFECT
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
-    CorruptedDataError
+    CorruptedDataError,
+    DuplicateRecordError,
+    QuestNotFoundError,
+    ItemNotFoundError
 )
 
+# Compiled snapshots are written next to the text file they were built from.
+# They are plain JSON, so a snapshot dropped into data/ can at worst be
+# rejected, never run
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_VERSION = 4
+SNAPSHOT_RECORD_TYPES = {"quests": Quest, "items": Item}
+SNAPSHOT_ID_FIELDS = {"quests": "quest_id", "items": "item_id"}
+
+# Supported on-disk formats for quest and item files
+TEXT_FORMAT = "text"
+JSONL_FORMAT = "jsonl"
+JSONL_HEADER = "#quest-chronicles-jsonl"
+
+# Offset indexes map record IDs to byte ranges in the source file
+INDEX_SUFFIX = ".index"
+INDEX_VERSION = 2
+_offset_indexes = {}  # filename -> (source stat, index) kept in memory
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_snapshot=True):
     """
     Load quest data from file.
 
     Reads quest entries separated by blank lines. Each block of text contains
     several key-value pairs that get parsed into a quest dictionary.
 
+    If a compiled snapshot of the same file exists and still matches it,
+    the validated quests are restored from the snapshot instead.
+
     Handles errors such as missing files, corrupted data, or invalid formatting.
     """
 
@@ -34,40 +63,23 @@ def load_quests(filename="data/quests.txt"):
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Quest file not found: {filename}")
 
-    quests = {}
-    try:
-        with open(filename, "r", encoding="utf-8") as file:
-            block = []  # store lines for the current quest block
-
-            for line in file:
-                line = line.strip()
-
-                # Blank line indicates end of a quest block
-                if line == "":
-                    if block:
-                        quest = parse_quest_block(block)
-                        quests[quest["quest_id"]] = quest
-                        block = []
-                else:
-                    block.append(line)
+    if use_snapshot:
+        signature = get_source_signature(filename)
+        cached = load_snapshot(filename, "quests", signature)
+        if cached is not None:
+            return cached
 
-            # Final block (in case file doesn't end with blank line)
-            if block:
-                quest = parse_quest_block(block)
-                quests[quest["quest_id"]] = quest
-
-    except UnicodeDecodeError:
-        # File unreadable due to corrupted encoding
-        raise CorruptedDataError("Quest file contains unreadable characters.")
+    quests = {}
+    for quest in iter_quests(filename):
+        quests[quest["quest_id"]] = quest
 
-    except Exception as e:
-        # Any other parsing error
-        raise InvalidDataFormatError(f"Quest file format invalid: {e}")
+    if use_snapshot:
+        write_snapshot(filename, "quests", signature, quests)
 
     return quests
 
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_snapshot=True):
     """
     Load item data from file.
 
@@ -78,33 +90,749 @@ def load_items(filename="data/items.txt"):
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Item file not found: {filename}")
 
+    if use_snapshot:
+        signature = get_source_signature(filename)
+        cached = load_snapshot(filename, "items", signature)
+        if cached is not None:
+            return cached
+
     items = {}
-    try:
-        with open(filename, "r", encoding="utf-8") as file:
-            block = []
-            for line in file:
-                line = line.strip()
-
-                if line == "":
-                    if block:
-                        item = parse_item_block(block)
-                        items[item["item_id"]] = item
-                        block = []
-                else:
-                    block.append(line)
-
-            # Handle leftover block
+    for item in iter_items(filename):
+        items[item["item_id"]] = item
+
+    if use_snapshot:
+        write_snapshot(filename, "items", signature, items)
+
+    return items
+
+
+# ============================================================================
+# STREAMING FUNCTIONS
+# ============================================================================
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yields validated quest dictionaries one block at a time.
+
+    Only the current block is held in memory, so callers that filter or
+    aggregate quests (for example by level) can walk very large files.
+    Raises the same exceptions as load_quests.
+    """
+
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest file not found: {filename}")
+
+    return iter_records(filename, QUEST_PARSER)
+
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yields validated item dictionaries one block at a time.
+    """
+
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item file not found: {filename}")
+
+    return iter_records(filename, ITEM_PARSER)
+
+
+def iter_blocks(file):
+    """
+    Yields the stripped lines of each blank-line separated block in a file.
+    """
+
+    block = []  # store lines for the current block
+
+    for line in file:
+        line = line.strip()
+
+        # Blank line indicates end of a block
+        if line == "":
             if block:
-                item = parse_item_block(block)
-                items[item["item_id"]] = item
+                yield block
+                block = []
+        else:
+            block.append(line)
+
+    # Final block (in case file doesn't end with blank line)
+    if block:
+        yield block
+
+
+# ============================================================================
+# SHARDED DIRECTORIES
+# ============================================================================
+
+def load_quest_shards(directory="data/quests", max_workers=None):
+    """
+    Loads every quest shard in a directory across a process pool.
+
+    Raises DuplicateRecordError if a quest ID appears more than once.
+    """
+    return load_shards(directory, QUEST_PARSER, max_workers)
+
+
+def load_item_shards(directory="data/items", max_workers=None):
+    """
+    Loads every item shard in a directory across a process pool.
+
+    Raises DuplicateRecordError if an item ID appears more than once.
+    """
+    return load_shards(directory, ITEM_PARSER, max_workers)
+
+
+def list_shards(directory):
+    """
+    Returns the sorted paths of the *.txt and *.jsonl shard files in a directory.
+    """
 
+    if not os.path.isdir(directory):
+        raise MissingDataFileError(f"Data directory not found: {directory}")
+
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith((".txt", ".jsonl"))
+    ]
+
+
+def load_shards(directory, compiled, max_workers=None):
+    """
+    Parses each shard in its own worker process and merges the results.
+
+    A single shard (or max_workers=1) is parsed in this process, since a
+    pool would only add start-up cost. Records are merged in shard order.
+    """
+
+    shards = list_shards(directory)
+
+    if len(shards) <= 1 or max_workers == 1:
+        results = [_parse_shard(shard, compiled) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_parse_shard, shards, [compiled] * len(shards)))
+
+    return merge_shard_records(zip(shards, results), compiled)
+
+
+def merge_shard_records(shard_results, compiled):
+    """
+    Merges (shard, records) pairs into one dictionary keyed by ID,
+    raising DuplicateRecordError if any ID is seen twice.
+    """
+
+    id_field = compiled["id_field"]
+    merged = {}
+    origins = {}
+
+    for shard, records in shard_results:
+        for record in records:
+            record_id = record[id_field]
+            if record_id in merged:
+                raise DuplicateRecordError(
+                    f"Duplicate {compiled['label'].lower()} ID '{record_id}' "
+                    f"in {origins[record_id]} and {shard}"
+                )
+            merged[record_id] = record
+            origins[record_id] = shard
+
+    return merged
+
+
+def _parse_shard(filename, compiled):
+    """
+    Worker entry point: parses one shard with the block parser.
+
+    Returns a list rather than a dict so duplicates inside a single shard
+    are still seen by the merge.
+    """
+    return list(iter_records(filename, compiled))
+
+
+# ============================================================================
+# COMPILED SNAPSHOTS
+# ============================================================================
+
+def get_snapshot_path(filename):
+    """
+    Returns the path of the compiled snapshot for a data file.
+    """
+    return filename + SNAPSHOT_SUFFIX
+
+
+def get_source_signature(filename):
+    """
+    Builds the key a snapshot is stored under: file size, modification
+    time and a hash of the file contents.
+    """
+
+    stat = os.stat(filename)
+    with open(filename, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    return (stat.st_size, stat.st_mtime_ns, digest)
+
+
+def load_snapshot(filename, kind, signature):
+    """
+    Restores validated records from a data file's snapshot.
+
+    Returns None when there is no snapshot, when it was built from a
+    different version of the source file, or when it cannot be read.
+    The caller then falls back to the text parser.
+    """
+
+    snapshot_path = get_snapshot_path(filename)
+    if not os.path.exists(snapshot_path):
+        return None
+
+    # A damaged snapshot is never fatal, the text file is the source of truth
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if snapshot.get("kind") != kind or snapshot.get("signature") != list(signature):
+        return None
+
+    # Each record is stored as a row of its field values, followed by its
+    # extra fields or null; build the record type again from that
+    fields = SNAPSHOT_RECORD_TYPES[kind].FIELDS
+    id_field = SNAPSHOT_ID_FIELDS[kind]
+    from_dict = SNAPSHOT_RECORD_TYPES[kind].from_dict
+    effects = {}
+    records = {}
+    try:
+        for row in snapshot["rows"]:
+            data = dict(zip(fields, row))
+            if row[-1]:
+                data.update(row[-1])
+            if kind == "items":
+                # Effects are immutable, so items with the same effect
+                # string share one compiled effect
+                text = data["effect"]
+                effect = effects.get(text)
+                if effect is None:
+                    effect = ItemEffect.parse(text) if text else NO_EFFECT
+                    effects[text] = effect
+                data["effect"] = effect
+            record = from_dict(data)
+            records[record[id_field]] = record
+    except Exception:
+        return None
+
+    return records
+
+
+def write_snapshot(filename, kind, signature, records):
+    """
+    Writes validated records to the data file's snapshot.
+
+    The snapshot is written to a temporary file first and then renamed,
+    so a reader never sees a half-written snapshot. Failing to write is
+    ignored because the snapshot is only a cache.
+    """
+
+    snapshot_path = get_snapshot_path(filename)
+    temp_path = snapshot_path + ".tmp"
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "kind": kind,
+        "signature": list(signature),
+        "rows": [
+            [record[field] for field in SNAPSHOT_RECORD_TYPES[kind].FIELDS] + [record.extra]
+            for record in records.values()
+        ]
+    }
+
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            # Effects are stored in their text form, see load_snapshot
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"),
+                      default=format_text_value)
+        os.replace(temp_path, snapshot_path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+# ============================================================================
+# RANDOM ACCESS BY ID
+# ============================================================================
+
+def get_quest(quest_id, filename="data/quests.txt"):
+    """
+    Loads a single quest by ID without parsing the rest of the file.
+
+    Raises QuestNotFoundError if the quest is not in the file.
+    """
+
+    try:
+        return read_record(filename, quest_id, QUEST_PARSER)
+    except KeyError:
+        raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
+
+
+def get_item(item_id, filename="data/items.txt"):
+    """
+    Loads a single item by ID without parsing the rest of the file.
+
+    Raises ItemNotFoundError if the item is not in the file.
+    """
+
+    try:
+        return read_record(filename, item_id, ITEM_PARSER)
+    except KeyError:
+        raise ItemNotFoundError(f"Item '{item_id}' not found.")
+
+
+def read_record(filename, record_id, compiled):
+    """
+    Seeks to one record's block using the offset index and parses only it.
+
+    Raises KeyError if the ID is not in the index.
+    """
+
+    # An edit that kept the size and timestamp can leave the index stale.
+    # A stale offset lands on another record or mid-block, so a wrong ID
+    # or a parse error means rebuilding the index once and retrying.
+    try:
+        record = _read_indexed_block(filename, record_id, compiled)
+        if record.get(compiled["id_field"]) == record_id:
+            return record
+    except (InvalidDataFormatError, CorruptedDataError):
+        pass
+
+    invalidate_offset_index(filename)
+    return _read_indexed_block(filename, record_id, compiled)
+
+
+def _read_indexed_block(filename, record_id, compiled):
+    """
+    Reads and parses the block the offset index points to for record_id.
+    """
+
+    start, end = load_offset_index(filename, compiled)[record_id]
+    return read_block_at(filename, start, end, compiled)
+
+
+def read_block_at(filename, start, end, compiled, data_format=None):
+    """
+    Parses the block stored between two byte offsets of a data file.
+    """
+
+    if data_format is None:
+        data_format = detect_format(filename)
+
+    with open(filename, "rb") as f:
+        f.seek(start)
+        raw = f.read(end - start)
+
+    try:
+        text = raw.decode("utf-8")
     except UnicodeDecodeError:
-        raise CorruptedDataError("Item file contains unreadable characters.")
+        raise CorruptedDataError(f"{compiled['label']} file contains unreadable characters.")
 
-    except Exception as e:
-        raise InvalidDataFormatError(f"Item file format invalid: {e}")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return parse_source_block(lines, compiled, data_format)
 
-    return items
+
+def get_index_path(filename):
+    """
+    Returns the path of the offset index for a data file.
+    """
+    return filename + INDEX_SUFFIX
+
+
+def get_source_stat(filename):
+    """
+    Cheap change check for indexes: file size and modification time.
+    """
+
+    stat = os.stat(filename)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def load_offset_index(filename, compiled):
+    """
+    Returns the {record_id: (start, end)} index for a data file.
+
+    The index is reused from memory or from the index file next to the
+    source while the source's size and modification time are unchanged.
+    Otherwise it is rebuilt and written back.
+    """
+
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"{compiled['label']} file not found: {filename}")
+
+    source_stat = get_source_stat(filename)
+
+    cached = _offset_indexes.get(filename)
+    if cached is not None and cached[0] == source_stat:
+        return cached[1]
+
+    index = _read_index_file(filename, compiled, source_stat)
+    if index is None:
+        index = build_offset_index(filename, compiled)
+        _write_index_file(filename, compiled, source_stat, index)
+
+    _offset_indexes[filename] = (source_stat, index)
+    return index
+
+
+def build_offset_index(filename, compiled):
+    """
+    Scans a data file once and records the byte range of every block,
+    keyed by the block's ID field.
+    """
+
+    id_field = compiled["id_field"]
+    index = {}
+    offset = 0
+    start = None
+    record_id = None
+
+    if detect_format(filename) == JSONL_FORMAT:
+        return _build_jsonl_offset_index(filename, id_field)
+
+    with open(filename, "rb") as f:
+        for line in f:
+            stripped = line.strip()
+
+            if not stripped:
+                # Blank line closes the current block
+                if start is not None and record_id is not None:
+                    index[record_id] = (start, offset)
+                start = None
+                record_id = None
+            else:
+                if start is None:
+                    start = offset
+                key, sep, value = stripped.partition(b": ")
+                if sep and normalize_key(key.decode("utf-8", "replace")) == id_field:
+                    record_id = value.decode("utf-8", "replace").strip()
+
+            offset += len(line)
+
+    # Final block (in case file doesn't end with blank line)
+    if start is not None and record_id is not None:
+        index[record_id] = (start, offset)
+
+    return index
+
+
+def _build_jsonl_offset_index(filename, id_field):
+    """
+    Offset index for JSON Lines files, where every record is one line.
+    """
+
+    index = {}
+    offset = 0
+
+    with open(filename, "rb") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(b"#"):
+                try:
+                    record_id = json.loads(stripped).get(id_field)
+                except (ValueError, AttributeError):
+                    record_id = None
+                if record_id is not None:
+                    index[record_id] = (offset, offset + len(line))
+            offset += len(line)
+
+    return index
+
+
+def invalidate_offset_index(filename):
+    """
+    Drops the in-memory and on-disk index for a data file.
+    """
+
+    _offset_indexes.pop(filename, None)
+    try:
+        os.remove(get_index_path(filename))
+    except OSError:
+        pass
+
+
+def _read_index_file(filename, compiled, source_stat):
+    """
+    Reads a stored index, or returns None if it is missing or stale.
+    """
+
+    try:
+        with open(get_index_path(filename), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(stored, dict) or stored.get("version") != INDEX_VERSION:
+        return None
+    if stored.get("label") != compiled["label"] or stored.get("source_stat") != list(source_stat):
+        return None
+
+    # Entries are [record_id, start, end] so IDs keep their JSON type
+    try:
+        return {record_id: (start, end) for record_id, start, end in stored["entries"]}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_index_file(filename, compiled, source_stat, index):
+    """
+    Stores an index next to its data file. Failures are ignored because
+    the index can always be rebuilt.
+    """
+
+    index_path = get_index_path(filename)
+    temp_path = index_path + ".tmp"
+    stored = {
+        "version": INDEX_VERSION,
+        "label": compiled["label"],
+        "source_stat": list(source_stat),
+        "entries": [[record_id, start, end] for record_id, (start, end) in index.items()]
+    }
+
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, index_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+# ============================================================================
+# LAZY CATALOGS
+# ============================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only mapping of record ID -> record that parses on first access.
+
+    Creating the catalog only scans the file for block boundaries (using
+    the offset index). Each block is parsed the first time its key is read
+    and then kept, so it can stand in for the dicts from load_quests and
+    load_items. Format errors in a block surface when that block is read,
+    or all at once from parse_all.
+
+    Every access checks the file's size and modification time; if the
+    file changed, the boundaries are scanned again and parsed records
+    dropped, so records are never read from stale offsets.
+    """
+
+    def __init__(self, filename, compiled):
+        """
+        Scan block boundaries for the file; no block is parsed yet.
+        """
+        self.filename = filename
+        self.compiled = compiled
+        self._source_stat = None
+        self._refresh()
+
+    def __getitem__(self, record_id):
+        """
+        Returns the parsed record, parsing its block if needed.
+        """
+        self._refresh()
+        record = self._records.get(record_id)
+        if record is None:
+            start, end = self._ranges[record_id]
+            record = read_block_at(self.filename, start, end, self.compiled, self._format)
+            self._records[record_id] = record
+        return record
+
+    def __contains__(self, record_id):
+        """
+        Membership only needs the boundary scan, never a parse.
+        """
+        self._refresh()
+        return record_id in self._ranges
+
+    def __iter__(self):
+        self._refresh()
+        return iter(self._ranges)
+
+    def __len__(self):
+        self._refresh()
+        return len(self._ranges)
+
+    def parse_all(self):
+        """
+        Parses every block now, so format errors surface here rather than
+        on first access. Returns the catalog.
+
+        The file is read once from start to end instead of seeking to each
+        block in turn.
+        """
+        self._refresh()
+        id_field = self.compiled["id_field"]
+        records = {}
+        for record in iter_records(self.filename, self.compiled):
+            records[record[id_field]] = record
+        self._records = records
+        return self
+
+    def _refresh(self):
+        """
+        Rescans block boundaries if the file changed since the last scan.
+        """
+        if not os.path.exists(self.filename):
+            raise MissingDataFileError(f"{self.compiled['label']} file not found: {self.filename}")
+
+        source_stat = get_source_stat(self.filename)
+        if source_stat == self._source_stat:
+            return
+        self._ranges = dict(load_offset_index(self.filename, self.compiled))
+        self._format = detect_format(self.filename)
+        self._records = {}
+        self._source_stat = source_stat
+
+    def loaded_count(self):
+        """
+        Returns how many records have been parsed so far.
+        """
+        return len(self._records)
+
+
+def load_quest_catalog(filename="data/quests.txt"):
+    """
+    Returns a LazyCatalog of quests for the given file.
+    """
+    return LazyCatalog(filename, QUEST_PARSER)
+
+
+def load_item_catalog(filename="data/items.txt"):
+    """
+    Returns a LazyCatalog of items for the given file.
+    """
+    return LazyCatalog(filename, ITEM_PARSER)
+
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class ReloadableCatalog(Mapping):
+    """
+    Mapping of record ID -> record that can be refreshed from a live file.
+
+    Each block's text is hashed. On reload, blocks whose hash was seen
+    before reuse their already-parsed record, so only edited or new
+    blocks go through the parser.
+    """
+
+    def __init__(self, filename, compiled):
+        """
+        Load every record and remember the hash of each block.
+        """
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"{compiled['label']} file not found: {filename}")
+
+        self.filename = filename
+        self.compiled = compiled
+        self.records = {}
+        self._block_hashes = {}   # record_id -> block hash
+        self._source_stat = None
+        self.reload()
+
+    def __getitem__(self, record_id):
+        return self.records[record_id]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def reload(self, force=False):
+        """
+        Re-reads the file and applies adds, removes and updates in place.
+
+        The file is skipped when its size and modification time are
+        unchanged, unless force is True. Returns a diff dictionary with
+        "added", "removed" and "updated" lists of IDs. If any changed block
+        fails to parse, the error is raised and the catalog is left untouched.
+        """
+
+        source_stat = get_source_stat(self.filename)
+        if source_stat == self._source_stat and not force:
+            return {"added": [], "removed": [], "updated": []}
+
+        id_field = self.compiled["id_field"]
+        known = {}
+        for record_id, block_hash in self._block_hashes.items():
+            known[block_hash] = self.records[record_id]
+
+        data_format = detect_format(self.filename)
+        new_records = {}
+        new_hashes = {}
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                for block in iter_source_blocks(file, data_format):
+                    block_hash = hash_block(block)
+                    record = known.get(block_hash)
+                    if record is None:
+                        record = parse_source_block(block, self.compiled, data_format)
+                    new_records[record[id_field]] = record
+                    new_hashes[record[id_field]] = block_hash
+
+        except UnicodeDecodeError:
+            raise CorruptedDataError(
+                f"{self.compiled['label']} file contains unreadable characters."
+            )
+
+        diff = {
+            "added": [rid for rid in new_records if rid not in self.records],
+            "removed": [rid for rid in self.records if rid not in new_records],
+            "updated": [
+                rid for rid in new_records
+                if rid in self._block_hashes and self._block_hashes[rid] != new_hashes[rid]
+            ]
+        }
+
+        # Apply changes in place so existing references see the new data
+        for record_id in diff["removed"]:
+            del self.records[record_id]
+        for record_id in diff["added"] + diff["updated"]:
+            self.records[record_id] = new_records[record_id]
+
+        self._block_hashes = new_hashes
+        self._source_stat = source_stat
+        return diff
+
+
+def hash_block(lines):
+    """
+    Returns a short content hash for a block of stripped lines.
+    """
+    return hashlib.blake2b("\n".join(lines).encode("utf-8"), digest_size=16).digest()
+
+
+def load_reloadable_quests(filename="data/quests.txt"):
+    """
+    Returns a ReloadableCatalog of quests for the given file.
+    """
+    return ReloadableCatalog(filename, QUEST_PARSER)
+
+
+def load_reloadable_items(filename="data/items.txt"):
+    """
+    Returns a ReloadableCatalog of items for the given file.
+    """
+    return ReloadableCatalog(filename, ITEM_PARSER)
 
 
 # ============================================================================
@@ -148,7 +876,7 @@ def validate_item_data(item_dict):
             raise InvalidDataFormatError(f"Missing item field: {key}")
 
     # Ensure item type is one of the allowed types
-    if item_dict["type"] not in ["weapon", "armor", "consumable"]:
+    if item_dict["type"] not in ITEM_TYPES:
         raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
 
     # Cost must be an integer
@@ -203,77 +931,371 @@ def create_default_data_files():
 
 
 # ============================================================================
-# HELPER PARSING FUNCTIONS
+# SCHEMA-DRIVEN BLOCK PARSER
 # ============================================================================
+#
+# Every record type (quests, items, and later enemies or classes) is
+# described by a schema dictionary:
+#
+#   "label"    - name used in error messages ("Quest")
+#   "id_field" - field that identifies the record ("quest_id")
+#   "fields"   - field name -> converter taking the raw text value
+#   "required" - fields every record must contain
+#   "record_type" (optional) - class built from the parsed fields, such
+#                  as game_records.Quest; plain dicts are returned without it
+#   "validator" (optional) - checks records read from already-typed formats
+#                  such as JSON Lines, where the text converters do not run
+#
+# compile_schema turns a schema into a dispatch table keyed on the raw
+# "KEY" text found in the file, so parse_block can convert and validate
+# each line with a single dictionary lookup.
+
+ITEM_TYPES = ("weapon", "armor", "consumable")
+ITEM_TYPE_SET = frozenset(ITEM_TYPES)
+
+
+# Plain text and integer fields use the builtins directly as converters
+convert_text = str.strip
+convert_int = int
+
+
+def convert_item_type(value):
+    """Converter for the item TYPE field; rejects unknown types."""
+    value = value.strip()
+    if value not in ITEM_TYPE_SET:
+        raise InvalidDataFormatError(f"Invalid item type: {value}")
+    return value
+
+
+def convert_effect(value):
+    """
+    Converter for an item EFFECT field formatted as "stat:value", with
+    several modifiers separated by commas.
+    """
+    return ItemEffect.parse(value)
 
-def parse_quest_block(lines):
+
+def normalize_key(key):
+    """Turns a raw "KEY" from a data file into a field name."""
+    return key.strip().lower().replace(":", "")
+
+
+def compile_schema(schema):
+    """
+    Compiles a record schema into the table parse_block runs on.
+
+    The dispatch table maps both the raw upper-case key used in data
+    files and the normalized field name to (field, converter), so the
+    common case never has to lowercase the key.
+    """
+
+    dispatch = {}
+    for field, converter in schema["fields"].items():
+        dispatch[field] = (field, converter)
+        dispatch[field.upper()] = (field, converter)
+
+    return {
+        "label": schema["label"],
+        "id_field": schema["id_field"],
+        "dispatch": dispatch,
+        "required": frozenset(schema["required"]),
+        "required_order": tuple(schema["required"]),
+        "record_type": schema.get("record_type"),
+        "validator": schema.get("validator")
+    }
+
+
+def parse_block(lines, compiled):
     """
-    Converts a block of quest lines into a dictionary.
+    Converts a block of "KEY: value" lines into a validated dictionary.
 
-    Splits lines on ': ' to extract key-value pairs, converts numeric
-    values to integers, and validates the final dictionary.
+    Values are converted and type-checked as each line is read. Keys that
+    the schema does not know are kept as text. After the pass, the record
+    is checked for missing required fields.
     """
 
-    quest = {}
+    record = {}
+    dispatch = compiled["dispatch"]
+    label = compiled["label"]
     try:
         for line in lines:
             key, value = line.split(": ", 1)
 
-            # Normalize key formatting
-            key = key.strip().lower().replace(":", "")
+            entry = dispatch.get(key)
+            if entry is None:
+                # Unusual spelling of a known key, or a key the schema ignores
+                field = normalize_key(key)
+                entry = dispatch.get(field, (field, convert_text))
 
-            # Convert integer fields
-            if key in ["reward_xp", "reward_gold", "required_level"]:
-                value = int(value)
-            else:
-                value = value.strip()
+            field, converter = entry
+            record[field] = converter(value)
+
+        return finish_record(record, compiled)
+
+    except Exception as e:
+        raise InvalidDataFormatError(f"Error parsing {label.lower()} block: {e}")
+
+
+def finish_record(record, compiled):
+    """
+    Checks a converted record for missing required fields and builds the
+    schema's record type from it.
+    """
+
+    if not compiled["required"].issubset(record):
+        # Report the first missing field in schema order
+        missing = next(field for field in compiled["required_order"] if field not in record)
+        raise InvalidDataFormatError(
+            f"Missing {compiled['label'].lower()} field: {missing}"
+        )
+
+    record_type = compiled["record_type"]
+    if record_type is not None:
+        return record_type.from_dict(record)
+    return record
 
-            quest[key] = value
 
-        # Validate the completed quest dictionary
-        validate_quest_data(quest)
+def iter_records(filename, compiled):
+    """
+    Yields the validated records of a data file, one block at a time.
+
+    Read or parse failures are turned into the game's data exceptions.
+    """
 
-        return quest
+    label = compiled["label"]
+    try:
+        data_format = detect_format(filename)
+        with open(filename, "r", encoding="utf-8") as file:
+            for block in iter_source_blocks(file, data_format):
+                yield parse_source_block(block, compiled, data_format)
+
+    except UnicodeDecodeError:
+        # File unreadable due to corrupted encoding
+        raise CorruptedDataError(f"{label} file contains unreadable characters.")
 
     except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing quest block: {e}")
+        # Any other parsing error
+        raise InvalidDataFormatError(f"{label} file format invalid: {e}")
+
+
+QUEST_SCHEMA = {
+    "label": "Quest",
+    "id_field": "quest_id",
+    "fields": {
+        "quest_id": convert_text,
+        "title": convert_text,
+        "description": convert_text,
+        "reward_xp": convert_int,
+        "reward_gold": convert_int,
+        "required_level": convert_int,
+        "prerequisite": convert_text
+    },
+    "required": [
+        "quest_id", "title", "description",
+        "reward_xp", "reward_gold", "required_level", "prerequisite"
+    ],
+    "record_type": Quest,
+    "validator": validate_quest_data
+}
+
+ITEM_SCHEMA = {
+    "label": "Item",
+    "id_field": "item_id",
+    "fields": {
+        "item_id": convert_text,
+        "name": convert_text,
+        "type": convert_item_type,
+        "effect": convert_effect,
+        "cost": convert_int,
+        "description": convert_text
+    },
+    "required": ["item_id", "name", "type", "effect", "cost", "description"],
+    "record_type": Item,
+    "validator": validate_item_data
+}
+
+# Schemas are compiled once at import time
+QUEST_PARSER = compile_schema(QUEST_SCHEMA)
+ITEM_PARSER = compile_schema(ITEM_SCHEMA)
 
 
-def parse_item_block(lines):
+# ============================================================================
+# DATA FILE FORMATS
+# ============================================================================
+#
+# Besides the hand-written "KEY: value" text format, quest and item files
+# can be stored as JSON Lines: an optional "#quest-chronicles-jsonl" header
+# line followed by one JSON object per line. json.loads decodes a whole
+# record at once, which is much cheaper than splitting and converting
+# each field. Files ending in .jsonl, or starting with the header, are read
+# as JSON Lines; everything else is read as text.
+
+def detect_format(filename):
+    """
+    Returns TEXT_FORMAT or JSONL_FORMAT for a data file.
+    """
+
+    if filename.endswith(".jsonl"):
+        return JSONL_FORMAT
+
+    with open(filename, "rb") as f:
+        head = f.read(len(JSONL_HEADER))
+
+    if head == JSONL_HEADER.encode("utf-8"):
+        return JSONL_FORMAT
+    return TEXT_FORMAT
+
+
+def iter_source_blocks(file, data_format):
+    """
+    Yields the raw blocks of an open data file: groups of "KEY: value"
+    lines for text files, or single-line blocks for JSON Lines files.
     """
-    Converts a block of item lines into a dictionary.
 
-    Handles parsing the effect field specially since it represents
-    a dictionary containing stat modifications.
+    if data_format == JSONL_FORMAT:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield [line]
+    else:
+        yield from iter_blocks(file)
+
+
+def parse_source_block(block, compiled, data_format):
+    """
+    Parses a raw block from iter_source_blocks in the given format.
     """
 
-    item = {}
+    if data_format == JSONL_FORMAT:
+        return parse_json_record(block[0], compiled)
+    return parse_block(block, compiled)
+
+
+def parse_json_record(line, compiled):
+    """
+    Converts one JSON Lines record into a validated record.
+
+    Values are already typed, so the record is checked with the schema's
+    validator instead of the text converters.
+    """
+
+    label = compiled["label"]
     try:
-        for line in lines:
-            key, value = line.split(": ", 1)
-            key = key.strip().lower()
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise InvalidDataFormatError("record must be a JSON object")
 
-            # Convert cost to integer
-            if key == "cost":
-                value = int(value)
+        validator = compiled["validator"]
+        if validator is not None and compiled["required"].issubset(record):
+            validator(record)
 
-            # Handle the effect field formatted as "stat:value"
-            elif key == "effect":
-                stat, num = value.split(":")
-                item["effect"] = {stat.strip(): int(num.strip())}
-                continue
+        return finish_record(record, compiled)
 
+    except Exception as e:
+        raise InvalidDataFormatError(f"Error parsing {label.lower()} record: {e}")
+
+
+def format_text_value(value):
+    """
+    Formats a field value for the text format; effects become
+    "stat:value".
+    """
+
+    if isinstance(value, ItemEffect):
+        return str(value)
+    if isinstance(value, dict):
+        return ",".join(f"{stat}:{amount}" for stat, amount in value.items())
+    return str(value)
+
+
+def json_default(value):
+    """
+    Lets json.dumps write effects as {stat: value} objects.
+    """
+
+    if isinstance(value, ItemEffect):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_records(records, filename, compiled, data_format=None):
+    """
+    Writes records to a data file in the given format.
+
+    The format defaults to the one implied by the file extension. Returns
+    the number of records written.
+    """
+
+    if data_format is None:
+        data_format = JSONL_FORMAT if filename.endswith(".jsonl") else TEXT_FORMAT
+
+    # Write to a temporary file so a failed conversion never leaves a
+    # half-written data file behind
+    temp_path = filename + ".tmp"
+    count = 0
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            if data_format == JSONL_FORMAT:
+                f.write(f"{JSONL_HEADER} {compiled['label'].lower()}\n")
+                for record in records:
+                    f.write(json.dumps(dict(record), ensure_ascii=False,
+                                       default=json_default) + "\n")
+                    count += 1
             else:
-                value = value.strip()
+                for record in records:
+                    for key, value in record.items():
+                        f.write(f"{key.upper()}: {format_text_value(value)}\n")
+                    f.write("\n")
+                    count += 1
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
-            item[key] = value
+    os.replace(temp_path, filename)
+    return count
 
-        validate_item_data(item)
 
-        return item
+def convert_data_file(source, destination, compiled, data_format=None):
+    """
+    Streams every record from source into destination, translating
+    between the text and JSON Lines formats. Returns the record count.
+    """
+    return write_records(iter_records(source, compiled), destination, compiled, data_format)
 
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing item block: {e}")
+
+def convert_quest_file(source="data/quests.txt", destination="data/quests.jsonl"):
+    """
+    Converts a quest file between the text and JSON Lines formats.
+    """
+    return convert_data_file(source, destination, QUEST_PARSER)
+
+
+def convert_item_file(source="data/items.txt", destination="data/items.jsonl"):
+    """
+    Converts an item file between the text and JSON Lines formats.
+    """
+    return convert_data_file(source, destination, ITEM_PARSER)
+
+
+# ============================================================================
+# HELPER PARSING FUNCTIONS
+# ============================================================================
+
+def parse_quest_block(lines):
+    """
+    Converts a block of quest lines into a validated Quest record.
+    """
+    return parse_block(lines, QUEST_PARSER)
+
+
+def parse_item_block(lines):
+    """
+    Converts a block of item lines into a validated Item record.
+
+    The effect field becomes an ItemEffect holding the stat modifiers.
+    """
+    return parse_block(lines, ITEM_PARSER)
 
 
 # ============================================================================
@@ -0,0 +1,410 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Records Module
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+This module defines compact record types for loaded game data.
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping
+
+# ============================================================================
+# BASE RECORD
+# ============================================================================
+
+class Record(MutableMapping):
+    """
+    Fixed set of fields stored in __slots__ instead of a per-record dict.
+
+    Records support the same access as the dictionaries they replace
+    (record["field"], record.get(), "field" in record, items(), and
+    comparison with a plain dict), so code written for dicts keeps working.
+    Fields outside FIELDS are kept in a small "extra" dict.
+    """
+
+    __slots__ = ("extra",)
+
+    # Subclasses declare their fields in __slots__ and list which of them
+    # hold IDs worth interning; FIELDS and FIELD_SET are filled in for them.
+    # Slots starting with "_" are bookkeeping, not fields.
+    FIELDS = ()
+    FIELD_SET = frozenset()
+    INTERNED = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = cls.FIELDS + tuple(
+            slot for slot in cls.__dict__.get("__slots__", ()) if not slot.startswith("_")
+        )
+        cls.FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, **fields):
+        """
+        Build a record from keyword arguments.
+        """
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from a parsed dictionary.
+
+        This is the loaders' hot path, so it sets slots directly instead
+        of going through __setitem__ for every field.
+        """
+        record = cls.__new__(cls)
+        field_set = cls.FIELD_SET
+        interned = cls.INTERNED
+        extra = None
+        for key, value in data.items():
+            if key in field_set:
+                if key in interned and type(value) is str:
+                    value = sys.intern(value)
+                setattr(record, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        record.extra = extra
+        return record
+
+    def to_dict(self):
+        """
+        Returns the record as a plain dictionary.
+        """
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in self.FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELD_SET:
+            if key in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self.FIELD_SET:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+# ============================================================================
+# ITEM EFFECTS
+# ============================================================================
+
+class ItemEffect(Mapping):
+    """
+    Immutable, precompiled item effect.
+
+    An effect is one or more stat modifiers written as
+    "stat:value[,stat:value...]", e.g. "strength:5,magic:3". It is parsed
+    once when the item is loaded; inventory code reads the (stat, value)
+    pairs in modifiers directly. As a read-only mapping of stat to value,
+    an effect still compares equal to the {stat: value} dict it replaces.
+    """
+
+    __slots__ = ("modifiers",)
+
+    def __init__(self, modifiers=()):
+        modifiers = tuple((sys.intern(stat), int(value)) for stat, value in modifiers)
+        _check_unique_stats(modifiers, modifiers)
+        object.__setattr__(self, "modifiers", modifiers)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Compiles an effect string such as "strength:5,magic:3".
+        """
+        modifiers = []
+        for part in text.split(","):
+            stat, value = part.split(":")
+            stat = stat.strip()
+            if not stat:
+                raise ValueError(f"Effect has no stat name: {text!r}")
+            # int() ignores surrounding whitespace itself
+            modifiers.append((sys.intern(stat), int(value)))
+        _check_unique_stats(modifiers, text)
+
+        # Every item load parses an effect, so skip __init__'s second
+        # conversion pass over values that are already clean
+        effect = object.__new__(cls)
+        object.__setattr__(effect, "modifiers", tuple(modifiers))
+        return effect
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Returns value as an ItemEffect; accepts an effect string or a
+        {stat: value} mapping.
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.parse(value)
+        if isinstance(value, Mapping):
+            return cls(value.items())
+        raise TypeError(f"Cannot build an item effect from {type(value).__name__}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ItemEffect is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ItemEffect is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.modifiers,))
+
+    def __getitem__(self, stat):
+        for name, value in self.modifiers:
+            if name == stat:
+                return value
+        raise KeyError(stat)
+
+    def __iter__(self):
+        for name, _ in self.modifiers:
+            yield name
+
+    def __len__(self):
+        return len(self.modifiers)
+
+    def __hash__(self):
+        # Equality comes from Mapping and ignores modifier order, so the
+        # hash must too
+        return hash(frozenset(self.modifiers))
+
+    def __str__(self):
+        return ",".join(f"{stat}:{value}" for stat, value in self.modifiers)
+
+    def __repr__(self):
+        return f"ItemEffect({str(self)!r})"
+
+
+def _check_unique_stats(modifiers, source):
+    """
+    Rejects an effect that modifies the same stat twice, since only the
+    first modifier would ever be read.
+    """
+    if len(modifiers) > 1 and len({stat for stat, _ in modifiers}) != len(modifiers):
+        raise ValueError(f"Effect modifies a stat more than once: {source!r}")
+
+
+# An effect that changes nothing
+NO_EFFECT = ItemEffect()
+
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class Quest(Record):
+    """
+    A quest loaded from quests.txt.
+    """
+
+    INTERNED = frozenset(("quest_id", "prerequisite"))
+
+    __slots__ = (
+        "quest_id", "title", "description",
+        "reward_xp", "reward_gold", "required_level", "prerequisite"
+    )
+
+
+class Item(Record):
+    """
+    An item loaded from items.txt.
+    """
+
+    INTERNED = frozenset(("item_id", "type"))
+
+    __slots__ = ("item_id", "name", "type", "effect", "cost", "description")
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds an item, compiling its effect if it is not an ItemEffect yet.
+        """
+        record = super().from_dict(data)
+        # Parsed items already hold an ItemEffect; an exact type check
+        # keeps them clear of the slower abstract-class isinstance
+        effect = data.get("effect")
+        if effect is not None and type(effect) is not ItemEffect:
+            record.effect = ItemEffect.coerce(effect)
+        return record
+
+    def __setitem__(self, key, value):
+        if key == "effect":
+            value = ItemEffect.coerce(value)
+        super().__setitem__(key, value)
+
+
+class Character(Record):
+    """
+    A player character.
+
+    Drop-in replacement for the character dictionaries the game used to
+    pass around: character["health"], get(), items(), update() and
+    comparison with a dict all work, but the standard fields live in
+    slots, which takes a fraction of a dict's memory. Unknown fields still
+    go in "extra".
+
+    A character remembers which fields changed since it was last saved or
+    loaded (as a bitmask, so a clean character costs nothing extra); see
+    character_manager.mark_dirty.
+    """
+
+    INTERNED = frozenset(("class",))
+
+    # Types of the standard fields, as checked by validate_character_data
+    FIELD_TYPES = {
+        "name": str, "class": str,
+        "level": int, "health": int, "max_health": int, "strength": int,
+        "magic": int, "experience": int, "gold": int,
+        "inventory": list, "active_quests": list, "completed_quests": list
+    }
+
+    __slots__ = tuple(FIELD_TYPES) + ("_dirty", "_dirty_extra")
+
+    def __init__(self, fields=(), **kwargs):
+        """
+        Build a character from a mapping and/or keyword arguments, like
+        dict(). Every field starts out dirty.
+        """
+        self.extra = None
+        self._dirty = 0
+        self._dirty_extra = None
+        self.update(fields, **kwargs)
+
+    @classmethod
+    def from_dict(cls, data, dirty=True):
+        """
+        Builds a character from a parsed dictionary. Its fields start out
+        dirty unless dirty is False (e.g. for a character just loaded).
+
+        Characters are built on every load, so this marks the dirty bits
+        while it sets the slots instead of going through __setitem__.
+        """
+        character = cls.__new__(cls)
+        bits = cls._FIELD_BITS
+        mask = 0
+        extra = None
+        for key, value in data.items():
+            bit = bits.get(key)
+            if bit is not None:
+                setattr(character, key, value)
+                mask |= bit
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        for key in cls.INTERNED:
+            value = getattr(character, key, None)
+            if isinstance(value, str):
+                setattr(character, key, sys.intern(value))
+
+        character.extra = extra
+        character._dirty = mask if dirty else 0
+        character._dirty_extra = set(extra) if dirty and extra else None
+        return character
+
+    def __setitem__(self, key, value):
+        bit = self._FIELD_BITS.get(key)
+        if bit is None:
+            Record.__setitem__(self, key, value)
+            self.mark_dirty(key)
+            return
+        if key in self.INTERNED and isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, key, value)
+        self._dirty |= bit
+
+    def __delitem__(self, key):
+        Record.__delitem__(self, key)
+        self.mark_dirty(key)
+
+    def mark_dirty(self, *fields):
+        """
+        Records that fields were changed (e.g. a list changed in place).
+        """
+        bits = self._FIELD_BITS
+        for field in fields:
+            bit = bits.get(field)
+            if bit is not None:
+                self._dirty |= bit
+            elif self._dirty_extra is None:
+                self._dirty_extra = {field}
+            else:
+                self._dirty_extra.add(field)
+
+    def mark_clean(self):
+        """
+        Forgets all changes.
+        """
+        self._dirty = 0
+        self._dirty_extra = None
+
+    def is_dirty(self):
+        """
+        Returns True if any field changed since the last mark_clean.
+        """
+        return bool(self._dirty or self._dirty_extra)
+
+    @property
+    def dirty_fields(self):
+        """
+        The set of changed field names (a new set on every access).
+        """
+        dirty = self._dirty
+        fields = {field for field, bit in self._FIELD_BITS.items() if dirty & bit}
+        if self._dirty_extra:
+            fields.update(self._dirty_extra)
+        return fields
+
+    @dirty_fields.setter
+    def dirty_fields(self, fields):
+        self.mark_clean()
+        self.mark_dirty(*fields)
+
+
+Character._FIELD_BITS = {field: 1 << i for i, field in enumerate(Character.FIELDS)}
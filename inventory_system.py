@@ -15,6 +15,8 @@ from custom_exceptions import (
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+from character_manager import mark_dirty
+from game_records import ItemEffect, NO_EFFECT
 
 MAX_INVENTORY_SIZE = 20
 
@@ -24,12 +26,14 @@ def add_item_to_inventory(character, item_id):
     if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full.")
     character["inventory"].append(item_id)
+    mark_dirty(character, "inventory")
     return True
 
 def remove_item_from_inventory(character, item_id):
     if item_id not in character["inventory"]:
         raise ItemNotFoundError(f"Item '{item_id}' not found in inventory.")
     character["inventory"].remove(item_id)
+    mark_dirty(character, "inventory")
     return True
 
 def has_item(character, item_id):
@@ -44,6 +48,7 @@ def get_inventory_space_remaining(character):
 def clear_inventory(character):
     removed_items = character["inventory"].copy()
     character["inventory"].clear()
+    mark_dirty(character, "inventory")
     return removed_items
 
 # ============================================================================
@@ -53,28 +58,31 @@ def use_item(character, item_id, item_data):
         raise ItemNotFoundError(f"Item '{item_id}' not in inventory.")
     if item_data["type"] != "consumable":
         raise InvalidItemTypeError("Only consumable items can be used.")
-    stat, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, value)
+    effect = get_item_effect(item_data)
+    for stat, value in effect.modifiers:
+        apply_stat_effect(character, stat, value)
     remove_item_from_inventory(character, item_id)
     item_name = item_data.get('name', item_id)
-    return f"Used {item_name} (+{value} {stat})."
+    gains = ", ".join(f"+{value} {stat}" for stat, value in effect.modifiers)
+    return f"Used {item_name} ({gains})."
 
 def equip_weapon(character, item_id, item_data):
     if "item_data" not in character:
         character["item_data"] = {}
     character["item_data"][item_id] = item_data
+    mark_dirty(character, "item_data")
     if not has_item(character, item_id):
         raise ItemNotFoundError(f"Weapon '{item_id}' not in inventory.")
     if item_data["type"] != "weapon":
         raise InvalidItemTypeError("Item is not a weapon.")
-    stat, value = parse_item_effect(item_data["effect"])
+    effect = get_item_effect(item_data)
     if character.get("equipped_weapon"):
         old_weapon = character["equipped_weapon"]
-        old_data = character["item_data"].get(old_weapon, {"effect": "strength:0"})
-        old_stat, old_val = parse_item_effect(old_data["effect"])
-        character[old_stat] -= old_val
+        remove_stat_effects(character, equipped_effect(character, old_weapon))
         character["inventory"].append(old_weapon)
-    character[stat] += value
+        mark_dirty(character, "inventory")
+    for stat, value in effect.modifiers:
+        character[stat] += value
     character["equipped_weapon"] = item_id
     remove_item_from_inventory(character, item_id)
     item_name = item_data.get('name', item_id)
@@ -84,18 +92,19 @@ def equip_armor(character, item_id, item_data):
     if "item_data" not in character:
         character["item_data"] = {}
     character["item_data"][item_id] = item_data
+    mark_dirty(character, "item_data")
     if not has_item(character, item_id):
         raise ItemNotFoundError(f"Armor '{item_id}' not in inventory.")
     if item_data["type"] != "armor":
         raise InvalidItemTypeError("Item is not armor.")
-    stat, value = parse_item_effect(item_data["effect"])
+    effect = get_item_effect(item_data)
     if character.get("equipped_armor"):
         old_armor = character["equipped_armor"]
-        old_data = character["item_data"].get(old_armor, {"effect": "defense:0"})
-        old_stat, old_val = parse_item_effect(old_data["effect"])
-        character[old_stat] -= old_val
+        remove_stat_effects(character, equipped_effect(character, old_armor))
         character["inventory"].append(old_armor)
-    character[stat] += value
+        mark_dirty(character, "inventory")
+    for stat, value in effect.modifiers:
+        character[stat] += value
     character["equipped_armor"] = item_id
     remove_item_from_inventory(character, item_id)
     return f"Equipped armor: {item_data['name']}."
@@ -104,12 +113,11 @@ def unequip_weapon(character):
     if not character.get("equipped_weapon"):
         return None
     weapon_id = character["equipped_weapon"]
-    effect = character["item_data"].get(weapon_id, {"effect": "strength:0"})["effect"]
-    stat, value = parse_item_effect(effect)
-    character[stat] -= value
+    remove_stat_effects(character, equipped_effect(character, weapon_id))
     if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Cannot unequip: inventory full.")
     character["inventory"].append(weapon_id)
+    mark_dirty(character, "inventory")
     character["equipped_weapon"] = None
     return weapon_id
 
@@ -117,12 +125,11 @@ def unequip_armor(character):
     if not character.get("equipped_armor"):
         return None
     armor_id = character["equipped_armor"]
-    effect = character["item_data"].get(armor_id, {"effect": "defense:0"})["effect"]
-    stat, value = parse_item_effect(effect)
-    character[stat] -= value
+    remove_stat_effects(character, equipped_effect(character, armor_id))
     if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Cannot unequip: inventory full.")
     character["inventory"].append(armor_id)
+    mark_dirty(character, "inventory")
     character["equipped_armor"] = None
     return armor_id
 
@@ -135,6 +142,7 @@ def purchase_item(character, item_id, item_data):
         raise InventoryFullError("Inventory full.")
     character["gold"] -= item_data["cost"]
     character["inventory"].append(item_id)
+    mark_dirty(character, "inventory")
     return True
 
 def sell_item(character, item_id, item_data):
@@ -148,8 +156,40 @@ def sell_item(character, item_id, item_data):
 # ============================================================================
 
 def parse_item_effect(effect_string):
-    stat, val = effect_string.split(":")
-    return stat.strip(), int(val.strip())
+    """
+    Parses a single "stat:value" effect into (stat, value). Item effects
+    are compiled with ItemEffect; this remains for older callers.
+    """
+    modifiers = ItemEffect.parse(effect_string).modifiers
+    if len(modifiers) != 1:
+        raise ValueError(f"Expected one stat modifier: {effect_string!r}")
+    return modifiers[0]
+
+def get_item_effect(item_data):
+    """
+    Returns an item's effect as an ItemEffect.
+
+    Items from the game_data loaders already hold a compiled effect, so
+    this is a type check; effect strings in hand-built item dicts are
+    compiled here.
+    """
+    return ItemEffect.coerce(item_data["effect"])
+
+def equipped_effect(character, item_id):
+    """
+    Returns the effect of an equipped item, or NO_EFFECT if its data is unknown.
+    """
+    item_data = character.get("item_data", {}).get(item_id)
+    if item_data is None:
+        return NO_EFFECT
+    return get_item_effect(item_data)
+
+def remove_stat_effects(character, effect):
+    """
+    Takes an item effect's modifiers back off a character's stats.
+    """
+    for stat, value in effect.modifiers:
+        character[stat] -= value
 
 def apply_stat_effect(character, stat_name, value):
     character[stat_name] += value
@@ -28,6 +28,10 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# Auto-saves go through a write-behind saver so the save after every menu
+# action doesn't rewrite the file each time
+character_saver = character_manager.WriteBehindSaver()
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -171,28 +175,33 @@ def game_loop():
     #   Save game after each action
 
     print(f"\nWelcome, {current_character['name']}!")
-    while game_running:
-        choice = game_menu()
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-        elif choice == 5:
-            shop()
-        elif choice == 6:
+    try:
+        while game_running:
+            choice = game_menu()
+            if choice == 1:
+                view_character_stats()
+            elif choice == 2:
+                view_inventory()
+            elif choice == 3:
+                quest_menu()
+            elif choice == 4:
+                explore()
+            elif choice == 5:
+                shop()
+            elif choice == 6:
+                save_game()
+                if flush_saves():
+                    print("Game saved. Exiting...")
+                game_running = False
+            else:
+                print("Invalid choice.")
+
+            # Auto-save after each action
             save_game()
-            print("Game saved. Exiting...")
-            game_running = False
-        else:
-            print("Invalid choice.")
-
-        # Auto-save after each action
-        save_game()
-
+    finally:
+        # The saver's thread dies with the program, so queued auto-saves
+        # are written here however the loop ends (quit, error, Ctrl+C)
+        flush_saves()
     #pass
 
 def game_menu():
@@ -261,7 +270,10 @@ def view_inventory():
     # Handle exceptions from inventory_system
 
     # --- IMPLEMENTATION ADDED BELOW ---
-    inventory_system.display_inventory(current_character, all_items)
+    try:
+        inventory_system.display_inventory(current_character, all_items)
+    except DataError as e:
+        print(f"Error reading item data: {e}")
 
     # Simple usage menu
     while True:
@@ -360,7 +372,12 @@ def shop():
     print("\nWelcome to the shop!")
     print(f"Your gold: {current_character['gold']}")
     print("Available items:")
-    for item_id, data in all_items.items():
+    for item_id in all_items:
+        try:
+            data = all_items[item_id]
+        except DataError as e:
+            print(f"{item_id}: unavailable ({e})")
+            continue
         print(f"{item_id}: {data['name']} ({data['type']}) - Cost: {data['cost']}")
 
     print("1. Buy  2. Sell  3. Back")
@@ -398,11 +415,20 @@ def save_game():
 
     # --- IMPLEMENTATION ADDED BELOW ---
     try:
-        character_manager.save_character(current_character)
+        character_saver.save(current_character)
     except Exception as e:
         print(f"Error saving game: {e}")
     #pass
 
+def flush_saves():
+    """Write any queued auto-saves to disk; returns True if they were written"""
+    try:
+        character_saver.flush()
+        return True
+    except Exception as e:
+        print(f"Error saving game: {e}")
+        return False
+
 def load_game_data():
     """Load all quest and item data from files"""
     global all_quests, all_items
@@ -414,14 +440,16 @@ def load_game_data():
     # If files missing, create defaults with game_data.create_default_data_files()
 
     # --- IMPLEMENTATION ADDED BELOW ---
+    # Catalogs only scan block boundaries here; a block with bad data is
+    # reported when the game first reads that record
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quest_catalog()
+        all_items = game_data.load_item_catalog()
     except (MissingDataFileError, InvalidDataFormatError):
         print("Data files missing or invalid. Creating default files.")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quest_catalog()
+        all_items = game_data.load_item_catalog()
     #pass
 
 def handle_character_death():
@@ -0,0 +1,204 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Progression Module
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+This module defines XP curves: how much experience each level needs.
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+
+# Stats every level-up adds (health is also refilled to max_health)
+LEVEL_UP_GAINS = {"max_health": 10, "strength": 2, "magic": 2}
+
+# Levels precomputed when an open-ended curve is created; more are added
+# the first time a character gets that far
+PRECOMPUTED_LEVELS = 100
+
+# ============================================================================
+# CURVES
+# ============================================================================
+
+class ProgressionCurve(ABC):
+    """
+    Base class for XP curves. Subclasses define xp_to_next(level), the XP
+    needed to go from level to level + 1.
+
+    The running totals of those costs are kept in a sorted list, so the
+    level for any amount of XP is one bisect instead of a loop over every
+    level in between. Levels stop at max_level if it is set, and so does
+    XP: a character at max_level holds no experience.
+    """
+
+    def __init__(self, max_level=None):
+        self.max_level = max_level
+        self._cumulative = [0]   # index i: total XP from level 1 to level i + 1
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def xp_to_next(self, level):
+        """
+        Returns the XP needed to go from level to level + 1.
+        """
+
+    def total_xp_for_level(self, level):
+        """
+        Returns the total XP needed to reach level from level 1.
+        """
+        self._check_level(level)
+        self._extend(lambda cumulative: len(cumulative) < level)
+        return self._cumulative[level - 1]
+
+    def level_for_total_xp(self, total_xp):
+        """
+        Returns (level, leftover XP) for a character with total_xp in all.
+        """
+        self._extend(lambda cumulative: cumulative[-1] <= total_xp)
+        level = max(1, bisect_right(self._cumulative, total_xp))
+        return level, total_xp - self._cumulative[level - 1]
+
+    def cumulative_xp(self, level=1, total_xp=0):
+        """
+        Returns the running XP totals (index i: total XP from level 1 to
+        level i + 1), extended to cover level and total_xp. The list is
+        shared; don't modify it.
+        """
+        if self.max_level is not None:
+            level = min(level, self.max_level)
+        self._extend(lambda cumulative: len(cumulative) < level or cumulative[-1] <= total_xp)
+        return self._cumulative
+
+    def resolve(self, level, experience):
+        """
+        Applies any level-ups owed to a character at level holding
+        experience XP towards the next one. Returns (level, experience);
+        characters never lose levels here. XP past max_level is dropped.
+        """
+        if self._at_level_cap(level):
+            return level, 0
+
+        base = self.total_xp_for_level(level)
+        new_level, leftover = self.level_for_total_xp(base + experience)
+        if new_level <= level:
+            return level, experience
+        if self._at_level_cap(new_level):
+            leftover = 0
+        return new_level, leftover
+
+    def _check_level(self, level):
+        if level < 1 or (self.max_level is not None and level > self.max_level):
+            raise ValueError(f"Level {level} is outside this curve")
+
+    def _at_level_cap(self, level):
+        return self.max_level is not None and level >= self.max_level
+
+    def _extend(self, needs_more):
+        """
+        Appends levels to the running totals while needs_more(totals) holds.
+        """
+        cumulative = self._cumulative
+        if not needs_more(cumulative) or self._at_max(cumulative):
+            return
+        with self._lock:
+            while needs_more(cumulative) and not self._at_max(cumulative):
+                cost = int(self.xp_to_next(len(cumulative)))
+                if cost <= 0:
+                    raise ValueError(f"Level {len(cumulative)} must need positive XP")
+                cumulative.append(cumulative[-1] + cost)
+
+    def _at_max(self, cumulative):
+        return self.max_level is not None and len(cumulative) >= self.max_level
+
+
+class LinearCurve(ProgressionCurve):
+    """
+    Each level costs step XP more than the last: level * step.
+
+    The running total to reach level L is step * L * (L - 1) / 2, so
+    lookups solve that directly instead of extending the list; a huge
+    grant costs one square root, not a list entry per level.
+    """
+
+    def __init__(self, step=100, max_level=None):
+        super().__init__(max_level)
+        self.step = step
+        self.cumulative_xp(min(PRECOMPUTED_LEVELS, max_level or PRECOMPUTED_LEVELS))
+
+    def xp_to_next(self, level):
+        return level * self.step
+
+    def total_xp_for_level(self, level):
+        self._check_level(level)
+        return self.step * (level * (level - 1) // 2)
+
+    def level_for_total_xp(self, total_xp):
+        level = (1 + math.isqrt(1 + 8 * max(0, int(total_xp // self.step)))) // 2
+        if self.max_level is not None:
+            level = min(level, self.max_level)
+        return level, total_xp - self.total_xp_for_level(level)
+
+
+class QuadraticCurve(ProgressionCurve):
+    """
+    Level costs grow with the square of the level: a*level^2 + b*level + c.
+    """
+
+    def __init__(self, a=10, b=0, c=100, max_level=None):
+        super().__init__(max_level)
+        self.a = a
+        self.b = b
+        self.c = c
+        self.total_xp_for_level(min(PRECOMPUTED_LEVELS, max_level or PRECOMPUTED_LEVELS))
+
+    def xp_to_next(self, level):
+        return self.a * level * level + self.b * level + self.c
+
+
+class TableCurve(ProgressionCurve):
+    """
+    Level costs listed explicitly: costs[0] is the XP from level 1 to 2,
+    and so on. The last level is len(costs) + 1.
+    """
+
+    def __init__(self, costs):
+        costs = list(costs)
+        super().__init__(len(costs) + 1)
+        self.costs = costs
+        self.total_xp_for_level(self.max_level)
+
+    def xp_to_next(self, level):
+        return self.costs[level - 1]
+
+
+# ============================================================================
+# ACTIVE CURVE
+# ============================================================================
+
+# Curve used by gain_experience; the default matches the original
+# "level * 100 XP per level" rule
+DEFAULT_CURVE = LinearCurve(100)
+_curve = DEFAULT_CURVE
+
+
+def get_curve():
+    """
+    Returns the curve gain_experience uses.
+    """
+    return _curve
+
+
+def set_curve(curve):
+    """
+    Makes gain_experience use curve (DEFAULT_CURVE if None). Returns the
+    previous curve.
+    """
+    global _curve
+    previous = _curve
+    _curve = curve if curve is not None else DEFAULT_CURVE
+    return previous
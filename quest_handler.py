@@ -77,6 +77,7 @@ def accept_quest(character, quest_id, quest_data_dict):
     
     # Add to active quests
     character.setdefault("active_quests", []).append(quest_id)
+    character_manager.mark_dirty(character, "active_quests")
     return True
     #pass
 
@@ -117,6 +118,7 @@ def complete_quest(character, quest_id, quest_data_dict):
     # Remove from active, add to completed
     character["active_quests"].remove(quest_id)
     character.setdefault("completed_quests", []).append(quest_id)
+    character_manager.mark_dirty(character, "active_quests", "completed_quests")
     
     # Grant rewards
     character_manager.gain_experience(character, quest.get("reward_xp", 0))
@@ -138,6 +140,7 @@ def abandon_quest(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
     
     character["active_quests"].remove(quest_id)
+    character_manager.mark_dirty(character, "active_quests")
     return True
     #pass
 
@@ -0,0 +1,51 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Manifest Rebuild Tool
+
+Name: [Steven Thorpe]
+
+AI Usage: [Document any AI assistance used]
+
+Regenerates a save directory's manifest (the per-character summaries
+behind query_saved_characters) from the saves on disk.
+
+Usage:
+    python rebuild_manifest.py
+    python rebuild_manifest.py path/to/save_games
+"""
+
+import argparse
+import sys
+
+import character_manager
+import character_storage
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns a process exit code.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild a save directory's character manifest."
+    )
+    parser.add_argument("save_directory", nargs="?",
+                        default=character_manager.DEFAULT_SAVE_DIRECTORY,
+                        help="directory holding the saves (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    store = character_storage.FileCharacterStore(args.save_directory)
+    report = store.rebuild_manifest()
+
+    print(f"Indexed {report['indexed']} characters in {args.save_directory}")
+    if report["failed"]:
+        print("Could not read: " + ", ".join(report["failed"]), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
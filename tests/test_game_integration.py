@@ -14,6 +14,10 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import character_storage
+import progression
+import character_population
+from game_records import ItemEffect, Character
 
 # ============================================================================
 # CHARACTER INTEGRATION TESTS
@@ -40,6 +44,578 @@ def test_character_creation_and_saving():
     # Cleanup
     character_manager.delete_character("IntegrationTest")
 
+def test_write_behind_saver_coalesces_saves(tmp_path):
+    """Test that repeated saves inside the window become one atomic write"""
+    char = character_manager.create_character("SaverTest", "Rogue")
+    save_dir = str(tmp_path)
+    save_file = tmp_path / "SaverTest_save.txt"
+
+    saver = character_manager.WriteBehindSaver(save_dir, window=60,
+                                               fsync=character_manager.FSYNC_NONE)
+    for gold in (110, 120, 130):
+        char['gold'] = gold
+        assert saver.save(char) == True
+    assert not save_file.exists()
+    assert saver.pending_names() == ["SaverTest"]
+
+    saver.flush()
+    assert character_manager.load_character("SaverTest", save_dir)['gold'] == 130
+    assert os.listdir(save_dir) == ["SaverTest_save.txt"]   # no temp file left
+
+    # Saving unchanged data again is dropped
+    assert saver.save(char) == False
+    saver.close()
+
+    # With no window, saves are written immediately and fully synced
+    saver = character_manager.WriteBehindSaver(save_dir, window=0,
+                                               fsync=character_manager.FSYNC_FULL)
+    char['gold'] = 5
+    saver.save(char)
+    assert character_manager.load_character("SaverTest", save_dir)['gold'] == 5
+    saver.close()
+
+def test_write_behind_saver_keeps_refused_changes(tmp_path):
+    """Test that a save refused by the saver leaves the character dirty"""
+    char = character_manager.create_character("RefusedTest", "Rogue")
+    saver = character_manager.WriteBehindSaver(str(tmp_path), window=60,
+                                               fsync=character_manager.FSYNC_NONE)
+
+    # A stored background error is raised before the change is taken
+    saver._error = OSError("disk full")
+    with pytest.raises(OSError):
+        saver.save(char)
+    assert character_manager.is_dirty(char)
+
+    saver.close()
+    with pytest.raises(RuntimeError):
+        saver.save(char)
+    assert character_manager.is_dirty(char)
+    assert saver.pending_names() == []
+
+def test_game_loop_flushes_saves_when_interrupted(tmp_path, monkeypatch):
+    """Test that queued auto-saves are written even if the game loop dies"""
+    import main
+    saver = character_manager.WriteBehindSaver(str(tmp_path), window=60,
+                                               fsync=character_manager.FSYNC_NONE)
+    monkeypatch.setattr(main, "character_saver", saver)
+    main.current_character = character_manager.create_character("LoopTest", "Mage")
+
+    choices = iter([1])
+    def game_menu():
+        for choice in choices:
+            main.current_character['gold'] = 777
+            return choice
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(main, "game_menu", game_menu)
+    monkeypatch.setattr(main, "view_character_stats", lambda: None)
+    with pytest.raises(KeyboardInterrupt):
+        main.game_loop()
+
+    assert saver.pending_names() == []
+    assert character_manager.load_character("LoopTest", str(tmp_path))['gold'] == 777
+    saver.close()
+
+def test_concurrent_writes_of_one_save(tmp_path):
+    """Test that concurrent writers of the same save don't share a temp file"""
+    import threading
+    filename = str(tmp_path / "Race_save.txt")
+    errors = []
+
+    def writer(n):
+        try:
+            for _ in range(50):
+                character_manager.write_save_file(filename, str(n) * 1000,
+                                                  character_manager.FSYNC_NONE)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["Race_save.txt"]
+    content = open(filename).read()
+    assert content == content[0] * 1000
+
+def test_unchanged_character_save_is_skipped(tmp_path):
+    """Test that saving a character with no tracked changes writes nothing"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("DirtyTest", "Cleric")
+    assert character_manager.is_dirty(char)
+    character_manager.save_character(char, save_dir)
+    assert not character_manager.is_dirty(char)
+
+    loaded = character_manager.load_character("DirtyTest", save_dir)
+    assert not character_manager.is_dirty(loaded)
+
+    # Make the file stale so a rewrite would be visible
+    save_file = tmp_path / "DirtyTest_save.txt"
+    save_file.write_text(save_file.read_text() + "NOTE: untouched\n")
+    character_manager.save_character(loaded, save_dir)
+    assert "NOTE" in save_file.read_text()
+
+    # In-place list changes made through the APIs are tracked too
+    inventory_system.add_item_to_inventory(loaded, "health_potion")
+    assert loaded.dirty_fields == {"inventory"}
+    character_manager.heal_character(loaded, 5)
+    character_manager.save_character(loaded, save_dir)
+    assert "NOTE" not in save_file.read_text()
+    assert character_manager.load_character("DirtyTest", save_dir)['inventory'] == ["health_potion"]
+
+def test_sqlite_character_store(tmp_path):
+    """Test saving, loading, listing, deleting and importing with SQLite"""
+    save_dir = str(tmp_path)
+    for name in ("Bravo", "Alpha"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+
+    with character_storage.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        # Importing reads the files without filling the shared cache
+        character_manager.character_cache.clear()
+        assert store.import_text_saves(save_dir) == {"imported": 2, "failed": []}
+        assert not character_manager.character_cache._entries
+        assert store.list_saved_characters() == ["Alpha", "Bravo"]
+
+        char = store.load_character("Alpha")
+        assert char == character_manager.load_character("Alpha", save_dir)
+        char['gold'] = 999
+        store.save_character(char)
+        assert store.load_character("Alpha")['gold'] == 999
+
+        assert store.delete_character("Bravo") == True
+        assert store.list_saved_characters() == ["Alpha"]
+
+        from custom_exceptions import CharacterNotFoundError
+        with pytest.raises(CharacterNotFoundError):
+            store.load_character("Bravo")
+        with pytest.raises(CharacterNotFoundError):
+            store.delete_character("Bravo")
+
+        # Imports write rows directly; cached copies must not outlive them
+        assert character_manager.fetch_character(store, "Alpha")['gold'] == 999
+        store.import_text_saves(save_dir)
+        assert character_manager.fetch_character(store, "Alpha")['gold'] == 100
+
+def test_incomplete_store_fails_on_creation():
+    """Test that a backend missing interface methods can't be created"""
+    class SaveOnlyStore(character_storage.CharacterStore):
+        def save_character(self, character, force=False):
+            return True
+
+    with pytest.raises(TypeError):
+        SaveOnlyStore()
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: character_storage.FileCharacterStore(str(tmp_path)),
+    lambda tmp_path: character_storage.MemoryCharacterStore(),
+    lambda tmp_path: character_storage.SQLiteCharacterStore(str(tmp_path / "saves.db")),
+])
+def test_character_manager_delegates_to_store(tmp_path, make_store):
+    """Test that the save functions work the same on every storage backend"""
+    store = make_store(tmp_path)
+    previous = character_manager.set_store(store)
+    try:
+        char = character_manager.create_character("StoreTest", "Warrior")
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+        assert character_manager.save_character(char) == True
+        assert character_manager.list_saved_characters() == ["StoreTest"]
+
+        loaded = character_manager.load_character("StoreTest")
+        assert loaded == char
+        loaded['inventory'].append("extra")
+        assert character_manager.load_character("StoreTest")['inventory'] == ["iron_sword"]
+
+        assert character_manager.delete_character("StoreTest") == True
+        assert character_manager.list_saved_characters() == []
+
+        from custom_exceptions import CharacterNotFoundError
+        with pytest.raises(CharacterNotFoundError):
+            character_manager.load_character("StoreTest")
+    finally:
+        character_manager.set_store(previous)
+        store.close()
+
+def test_binary_save_format_and_migration(tmp_path):
+    """Test binary saves round-trip and text saves migrate to them"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("BinaryTest", "Rogue")
+    char['inventory'] = ["health_potion", "health_potion", "iron_sword"]
+    char['completed_quests'] = ["first_steps"]
+    char['equipped_weapon'] = "iron_sword"
+    character_manager.save_character(char, save_dir)
+
+    text_file = tmp_path / "BinaryTest_save.txt"
+    binary = character_manager.migrate_text_save(text_file.read_text())
+    assert binary[:4] == character_manager.BINARY_SAVE_MAGIC
+    assert len(binary) < len(text_file.read_text())
+    assert character_manager.parse_binary_save_data(binary) == char
+
+    # A save copied in by hand isn't in the manifest until it is migrated
+    copied = character_manager.create_character("CopiedIn", "Mage")
+    (tmp_path / "CopiedIn_save.txt").write_text(character_manager.format_save_data(copied))
+
+    store = character_storage.FileCharacterStore(
+        save_dir, save_format=character_manager.BINARY_SAVE_FORMAT)
+    assert store.load_character("BinaryTest") == char   # falls back to the text save
+    assert store.migrate_to_binary() == {"migrated": 2, "failed": []}
+    assert sorted(os.listdir(save_dir)) == ["BinaryTest_save.bin", "CopiedIn_save.bin"]
+    assert sorted(store.list_saved_characters()) == ["BinaryTest", "CopiedIn"]
+    assert store.load_character("BinaryTest") == char
+    assert sorted(s['name'] for s in store.character_summaries()) == ["BinaryTest", "CopiedIn"]
+
+    from custom_exceptions import InvalidSaveDataError
+    future = binary[:4] + bytes([99]) + binary[5:]
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.parse_binary_save_data(future)
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.parse_binary_save_data(binary[:-3])
+
+def test_journal_store_appends_and_compacts(tmp_path):
+    """Test that journal saves append changes and compact into snapshots"""
+    store = character_storage.JournalCharacterStore(str(tmp_path), compact_after=3)
+    char = character_manager.create_character("JournalTest", "Mage")
+    store.save_character(char)
+
+    for gold in (10, 20):
+        character_manager.add_gold(char, gold)
+        store.save_character(char)
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    store.save_character(char)
+    assert store.journal_length("JournalTest") == 3
+    assert '"inventory":["health_potion"]' in (tmp_path / "JournalTest.journal").read_text()
+
+    # Loading replays the journal over the snapshot, even in a new store
+    reopened = character_storage.JournalCharacterStore(str(tmp_path))
+    assert reopened.load_character("JournalTest") == char
+
+    # The next save compacts the journal
+    character_manager.add_gold(char, 5)
+    store.save_character(char)
+    assert store.journal_length("JournalTest") == 0
+    assert reopened.load_character("JournalTest") == char
+
+    # A torn append from a crash is dropped
+    with open(tmp_path / "JournalTest.journal", "a") as f:
+        f.write('{"set":{"gold":')
+    assert reopened.load_character("JournalTest") == char
+
+    # A journal left from before the latest snapshot is ignored
+    stale = (tmp_path / "JournalTest.journal").read_text()
+    character_manager.add_gold(char, 1)
+    store.save_character(char, force=True)
+    (tmp_path / "JournalTest.journal").write_text(stale + '{"set":{"gold":0}}\n')
+    assert reopened.load_character("JournalTest")['gold'] == char['gold']
+
+def test_deferred_saves_append_to_the_journal(tmp_path):
+    """Test that write-behind and async saves keep journaling only changes"""
+    import asyncio
+    store = character_storage.JournalCharacterStore(str(tmp_path))
+    char = character_manager.create_character("Deferred", "Rogue")
+    store.save_character(char)
+
+    with character_manager.WriteBehindSaver(window=0, store=store) as saver:
+        char['gold'] += 1
+        saver.save(char)
+    assert store.journal_length("Deferred") == 1
+
+    previous = character_manager.set_store(store)
+    try:
+        char['gold'] += 1
+        asyncio.run(character_manager.async_save_character(char))
+    finally:
+        character_manager.set_store(previous)
+    assert store.journal_length("Deferred") == 2
+    assert store.load_character("Deferred") == char
+
+def test_bulk_character_load_and_save(tmp_path):
+    """Test that bulk loads and saves report per-character errors"""
+    from custom_exceptions import CharacterNotFoundError, InvalidSaveDataError
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Bulk{i}", "Warrior") for i in range(5)]
+
+    report = character_manager.save_characters(chars, save_dir, max_workers=3)
+    assert report == {"saved": [c['name'] for c in chars], "errors": {}}
+
+    # Duplicate names are saved once, from the last copy
+    first = character_manager.create_character("Dup", "Mage")
+    last = character_manager.create_character("Dup", "Mage")
+    last['gold'] = 7
+    report = character_manager.save_characters([first, last] * 4, save_dir, max_workers=8)
+    assert report == {"saved": ["Dup"], "errors": {}}
+    assert character_manager.load_character("Dup", save_dir)['gold'] == 7
+
+    (tmp_path / "Broken_save.txt").write_text("garbage")
+    report = character_manager.load_characters(
+        ["Bulk3", "Missing", "Bulk0", "Broken"], save_dir, max_workers=3)
+
+    assert list(report["characters"]) == ["Bulk3", "Bulk0"]
+    assert report["characters"]["Bulk0"] == chars[0]
+    assert isinstance(report["errors"]["Missing"], CharacterNotFoundError)
+    assert isinstance(report["errors"]["Broken"], InvalidSaveDataError)
+
+def test_character_cache(tmp_path, monkeypatch):
+    """Test the LRU cache in front of load_character"""
+    cache = character_manager.CharacterCache(max_entries=2)
+    monkeypatch.setattr(character_manager, "character_cache", cache)
+    save_dir = str(tmp_path)
+    for name in ("CacheA", "CacheB", "CacheC"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+    cache.clear()
+
+    first = character_manager.load_character("CacheA", save_dir)
+    first['gold'] = 0   # changing a loaded character must not touch the cache
+    second = character_manager.load_character("CacheA", save_dir)
+    assert second['gold'] == 100
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Saves update the cached copy, deletes drop it
+    second['gold'] = 55
+    character_manager.save_character(second, save_dir)
+    assert character_manager.load_character("CacheA", save_dir)['gold'] == 55
+    character_manager.delete_character("CacheA", save_dir)
+    from custom_exceptions import CharacterNotFoundError
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("CacheA", save_dir)
+
+    # Edits and deletes that bypass the save functions are seen too
+    character_manager.load_character("CacheB", save_dir)
+    path = tmp_path / "CacheB_save.txt"
+    path.write_text(path.read_text().replace("GOLD: 100", "GOLD: 7"))
+    edited = character_manager.load_character("CacheB", save_dir)
+    assert edited['gold'] == 7
+    # A clean save is skipped, so it must not overwrite a newer save's entry
+    path.write_text(path.read_text().replace("GOLD: 7", "GOLD: 8"))
+    character_manager.save_character(edited, save_dir)
+    assert character_manager.load_character("CacheB", save_dir)['gold'] == 8
+    os.remove(path)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("CacheB", save_dir)
+    character_manager.save_character(character_manager.create_character("CacheB", "Mage"), save_dir)
+
+    # Count-based and size-based eviction
+    character_manager.load_character("CacheB", save_dir)
+    character_manager.load_character("CacheC", save_dir)
+    character_manager.save_character(character_manager.create_character("CacheD", "Rogue"), save_dir)
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] >= 1
+    tiny = character_manager.CharacterCache(max_bytes=1)
+    tiny.put(character_manager.get_store(save_dir), character_manager.create_character("Big", "Mage"))
+    assert tiny.stats()["entries"] == 0
+
+def test_async_character_persistence(tmp_path):
+    """Test that async saves are ordered per character and loads see them"""
+    import asyncio
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("AsyncTest", "Rogue")
+
+    async def scenario():
+        saves = []
+        for gold in (10, 20, 30):
+            char['gold'] = gold
+            saves.append(asyncio.create_task(
+                character_manager.async_save_character(char, save_dir)))
+            await asyncio.sleep(0)   # let the save start and take its copy
+        char['gold'] = 99   # changes after the calls don't leak into the saves
+        loaded = await character_manager.async_load_character("AsyncTest", save_dir)
+        await asyncio.gather(*saves)
+        names = await character_manager.async_list_saved_characters(save_dir)
+        return loaded, names
+
+    loaded, names = asyncio.run(scenario())
+    assert names == ["AsyncTest"]
+    assert loaded['gold'] == 30
+    assert character_manager.is_dirty(char)
+    character_manager.character_cache.clear()
+    assert character_manager.load_character("AsyncTest", save_dir)['gold'] == 30
+
+def test_progression_curves():
+    """Test that XP curves resolve many level-ups in one step"""
+    # The default curve keeps the old "level * 100 XP" rule
+    char = character_manager.create_character("CurveTest", "Warrior")
+    assert character_manager.gain_experience(char, 100 + 200 + 300 + 50)
+    assert (char['level'], char['experience']) == (4, 50)
+    assert (char['max_health'], char['strength'], char['magic']) == (150, 21, 11)
+    assert char['health'] == char['max_health']
+    assert not character_manager.gain_experience(char, 10)
+
+    # Huge grants are solved directly, without extending the running totals
+    big = character_manager.create_character("BigGrant", "Mage")
+    character_manager.gain_experience(big, 10 ** 15)
+    level = big['level']
+    assert progression.DEFAULT_CURVE.total_xp_for_level(level) + big['experience'] == 10 ** 15
+    assert big['experience'] < level * 100
+    assert len(progression.DEFAULT_CURVE.cumulative_xp()) == progression.PRECOMPUTED_LEVELS
+    assert progression.LinearCurve(100).level_for_total_xp(300) == (3, 0)
+    with pytest.raises(TypeError):
+        progression.ProgressionCurve()
+
+    quadratic = progression.QuadraticCurve(a=10, b=0, c=0)
+    assert quadratic.level_for_total_xp(10 + 40 + 5) == (3, 5)
+
+    table = progression.TableCurve([50, 75])
+    capped = character_manager.create_character("TableTest", "Rogue")
+    assert character_manager.gain_experience(capped, 500, curve=table)
+    assert (capped['level'], capped['experience']) == (3, 0)   # no XP past the last level
+    assert not character_manager.gain_experience(capped, 500, curve=table)
+    assert capped['experience'] == 0
+
+def test_slotted_character(tmp_path):
+    """Test that Character works like the character dicts it replaces"""
+    import pickle
+    char = character_manager.create_character("SlotTest", "Cleric")
+    assert isinstance(char, Character)
+    assert char == {
+        "name": "SlotTest", "class": "Cleric", "level": 1, "health": 100,
+        "max_health": 100, "strength": 10, "magic": 15, "experience": 0,
+        "gold": 100, "inventory": [], "active_quests": [], "completed_quests": []
+    }
+    assert not hasattr(char, "__dict__")
+
+    # Dirty tracking covers slots and extra fields alike
+    character_manager.mark_clean(char)
+    char['gold'] += 5
+    char['title'] = "Healer"
+    char.pop('title')
+    assert char.dirty_fields == {"gold", "title"}
+
+    character_manager.save_character(char, str(tmp_path))
+    assert not character_manager.is_dirty(char)
+    loaded = character_manager.load_character("SlotTest", str(tmp_path))
+    assert isinstance(loaded, Character) and loaded == char
+    assert not character_manager.is_dirty(loaded)
+    assert pickle.loads(pickle.dumps(loaded)) == loaded
+
+def test_validate_character_data():
+    """Test that loaded characters are checked against Character.FIELD_TYPES"""
+    from custom_exceptions import InvalidSaveDataError
+    char = character_manager.copy_character(character_manager.create_character("Valid", "Mage"))
+    assert character_manager.validate_character_data(char)
+    for field, value, message in (("completed_quests", None, "Missing field: completed_quests"),
+                                  ("gold", "100", "gold must be an integer"),
+                                  ("inventory", "", "inventory must be a list"),
+                                  ("name", 5, "name must be a string")):
+        broken = dict(char)
+        if value is None:
+            del broken[field]
+        else:
+            broken[field] = value
+        with pytest.raises(InvalidSaveDataError, match=message):
+            character_manager.validate_character_data(broken)
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_character_population_batch_operations(use_numpy):
+    """Test that population batch operations match the per-character ones"""
+    from custom_exceptions import CharacterDeadError
+    if use_numpy and character_population.numpy is None:
+        pytest.skip("NumPy is not installed")
+    chars = [character_manager.create_character(f"Pop{i}", "Warrior") for i in range(6)]
+    for i, char in enumerate(chars):
+        character_manager.gain_experience(char, i * 250)
+        char['health'] = 30 * i - 30
+    expected = [Character.from_dict(character_manager.copy_character(c)) for c in chars]
+    population = character_population.CharacterPopulation(chars, use_numpy=use_numpy)
+    assert population.to_characters() == chars
+
+    mask = [i % 2 == 0 for i in range(6)]
+    healed = population.heal_character(50, mask)
+    assert list(healed) == [character_manager.heal_character(c, 50) if m else 0
+                            for c, m in zip(expected, mask)]
+    population.add_gold(25, mask)
+    for char, m in zip(expected, mask):
+        if m:
+            character_manager.add_gold(char, 25)
+
+    dead = population.is_character_dead()
+    assert list(dead) == [character_manager.is_character_dead(c) for c in expected]
+    with pytest.raises(CharacterDeadError):
+        population.gain_experience(100)
+    alive = [not d for d in dead]
+    leveled = population.gain_experience(1000, alive)
+    assert list(leveled) == [character_manager.gain_experience(c, 1000) if a else False
+                             for c, a in zip(expected, alive)]
+
+    # Huge grants and capped curves match the per-character results too
+    for xp_amount, curve in ((1500, progression.TableCurve([600] * 7)), (10 ** 12, None)):
+        population.gain_experience(xp_amount, alive, curve)
+        for char, a in zip(expected, alive):
+            if a:
+                character_manager.gain_experience(char, xp_amount, curve)
+        assert population.to_characters() == expected
+
+    # Failed operations change nothing
+    with pytest.raises(ValueError):
+        population.add_gold(-1000)
+    assert population.to_characters() == expected
+
+    # Rows convert back and forth
+    row = population.row_of("Pop3")
+    char = population.character(row)
+    char['gold'] = 7
+    population.set_character(row, char)
+    assert population.character(row)['gold'] == 7
+
+def test_save_manifest(tmp_path, monkeypatch):
+    """Test that the save manifest answers listings without opening saves"""
+    import json
+    import rebuild_manifest
+    save_dir = str(tmp_path)
+    for i, character_class in enumerate(["Warrior", "Mage", "Mage", "Rogue"]):
+        char = character_manager.create_character(f"Hero{i}", character_class)
+        char['gold'] = 100 + i
+        character_manager.gain_experience(char, i * 300)
+        character_manager.save_character(char, save_dir)
+    # Saves don't build a missing manifest; the first listing does
+    manifest = tmp_path / character_storage.MANIFEST_FILENAME
+    assert not manifest.exists()
+
+    result = character_manager.query_saved_characters(save_dir, character_class="Mage")
+    assert [c['name'] for c in result["characters"]] == ["Hero1", "Hero2"]
+    assert manifest.exists()
+
+    # From here on, listings must not open any save
+    def no_loads(self, name):
+        raise AssertionError("save opened")
+    monkeypatch.setattr(character_storage.FileCharacterStore, "load_with_filename", no_loads)
+
+    page = character_manager.query_saved_characters(
+        save_dir, sort_by="gold", descending=True, offset=1, limit=2)
+    assert page["total"] == 4
+    assert [c['gold'] for c in page["characters"]] == [102, 101]
+    summary = character_manager.query_saved_characters(save_dir, min_level=4, character_class="Rogue")["characters"][0]
+    assert summary['name'] == "Hero3" and summary['size'] > 0 and summary['mtime']
+
+    # Saves and deletes update it incrementally, also for other stores of the directory
+    char = character_manager.create_character("Hero1", "Mage")
+    character_manager.gain_experience(char, 5000)
+    character_manager.save_character(char, save_dir)
+    character_manager.delete_character("Hero2", save_dir)
+    other = character_storage.FileCharacterStore(save_dir)
+    names = {s['name']: s['level'] for s in other.character_summaries()}
+    assert names == {"Hero0": 1, "Hero1": 10, "Hero3": 4}
+
+    # A line torn by a crash is cut off, not merged with the next append
+    with open(manifest, "a") as f:
+        f.write('{"name":"Hal')
+    char['gold'] = 3
+    character_manager.save_character(char, save_dir)
+    lines = manifest.read_text().splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert {s['name']: s['gold'] for s in other.character_summaries()}["Hero1"] == 3
+
+    # Repeated saves don't grow the manifest without bound
+    for gold in range(50):
+        char['gold'] = gold
+        character_manager.save_character(char, save_dir)
+    assert len(manifest.read_text().splitlines()) <= 3 * 4
+
+    monkeypatch.undo()
+    manifest.write_text("garbage\n")
+    (tmp_path / "Broken_save.txt").write_text("garbage")
+    assert rebuild_manifest.main([save_dir]) == 1
+    assert character_manager.query_saved_characters(save_dir)["total"] == 3
+
 def test_character_leveling_system():
     """Test that character leveling works correctly"""
     char = character_manager.create_character("LevelTest", "Mage")
@@ -104,6 +680,47 @@ def test_equipment_system():
     assert 'equipped_weapon' in char
     assert char['equipped_weapon'] == "iron_sword"
 
+def test_compiled_item_effects():
+    """Test that loaded items carry compiled, multi-stat effects"""
+    items = game_data.load_items("data/items.txt", use_snapshot=False)
+    assert isinstance(items['iron_sword']['effect'], ItemEffect)
+    assert items['iron_sword']['effect'] == {'strength': 5}
+
+    char = character_manager.create_character("EffectTest", "Mage")
+    original_strength = char['strength']
+    original_magic = char['magic']
+
+    staff = {'name': 'Staff', 'type': 'weapon', 'effect': ItemEffect.parse("strength:5, magic:3")}
+    inventory_system.add_item_to_inventory(char, "staff")
+    inventory_system.equip_weapon(char, "staff", staff)
+    assert (char['strength'], char['magic']) == (original_strength + 5, original_magic + 3)
+
+    # Equipping a catalog weapon removes every modifier of the old one
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", items['iron_sword'])
+    assert (char['strength'], char['magic']) == (original_strength + 5, original_magic)
+
+    inventory_system.unequip_weapon(char)
+    assert (char['strength'], char['magic']) == (original_strength, original_magic)
+
+    with pytest.raises(AttributeError):
+        staff['effect'].modifiers = ()
+
+    # Effects that compare equal hash equal, whatever the modifier order
+    swapped = ItemEffect.parse("magic:3,strength:5")
+    assert swapped == staff['effect']
+    assert len({swapped, staff['effect']}) == 1
+
+    # A stat listed twice is a format error, not a silently dropped modifier
+    from custom_exceptions import InvalidDataFormatError
+    with pytest.raises(ValueError):
+        ItemEffect([("strength", 5), ("strength", 3)])
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block([
+            "ITEM_ID: twice", "NAME: Twice", "TYPE: weapon",
+            "EFFECT: strength:5,strength:3", "COST: 1", "DESCRIPTION: Bad"
+        ])
+
 def test_shop_system():
     """Test buying and selling items"""
     char = character_manager.create_character("ShopTest", "Mage")
@@ -274,6 +891,311 @@ def test_data_validation():
     
     assert game_data.validate_item_data(valid_item) == True
 
+def test_iter_quests_streams_records():
+    """Test that iter_quests yields the same quests load_quests returns"""
+    quests = game_data.load_quests("data/quests.txt", use_snapshot=False)
+
+    streamed = game_data.iter_quests("data/quests.txt")
+    low_level = [q['quest_id'] for q in streamed if q['required_level'] <= 2]
+
+    assert low_level == [qid for qid, q in quests.items() if q['required_level'] <= 2]
+    assert len(low_level) > 0
+
+def test_custom_schema_parser():
+    """Test that a new record type plugs into the schema-driven parser"""
+    enemy_parser = game_data.compile_schema({
+        'label': 'Enemy',
+        'id_field': 'enemy_id',
+        'fields': {'enemy_id': game_data.convert_text, 'health': game_data.convert_int},
+        'required': ['enemy_id', 'health']
+    })
+
+    enemy = game_data.parse_block(["ENEMY_ID: goblin", "HEALTH: 50"], enemy_parser)
+    assert enemy == {'enemy_id': 'goblin', 'health': 50}
+
+    from custom_exceptions import InvalidDataFormatError
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_block(["ENEMY_ID: goblin", "HEALTH: lots"], enemy_parser)
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_block(["ENEMY_ID: goblin"], enemy_parser)
+
+    # Missing fields are reported in schema order, and unknown keys don't
+    # grow the shared dispatch table
+    with pytest.raises(InvalidDataFormatError, match="field: enemy_id"):
+        game_data.parse_block(["LOOT: gold"], enemy_parser)
+    size = len(enemy_parser['dispatch'])
+    game_data.parse_block(["ENEMY_ID: orc", "HEALTH: 9", "LOOT: gold"], enemy_parser)
+    assert len(enemy_parser['dispatch']) == size
+
+def test_quest_snapshot_cache(tmp_path):
+    """Test that quests are restored from a snapshot until the file changes"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(
+        "QUEST_ID: cached_quest\n"
+        "TITLE: Cached\n"
+        "DESCRIPTION: Test\n"
+        "REWARD_XP: 10\n"
+        "REWARD_GOLD: 5\n"
+        "REQUIRED_LEVEL: 1\n"
+        "PREREQUISITE: NONE\n"
+    )
+
+    first = game_data.load_quests(str(quest_file))
+    assert os.path.exists(game_data.get_snapshot_path(str(quest_file)))
+
+    # Second load comes from the snapshot and matches the parsed data
+    second = game_data.load_quests(str(quest_file))
+    assert second == first
+
+    # Editing the source invalidates the snapshot
+    quest_file.write_text(quest_file.read_text().replace("REWARD_XP: 10", "REWARD_XP: 99"))
+    third = game_data.load_quests(str(quest_file))
+    assert third['cached_quest']['reward_xp'] == 99
+
+def test_item_snapshot_is_plain_json(tmp_path):
+    """Test that item snapshots are JSON and anything else is ignored"""
+    import json
+    import pickle
+    from game_records import ItemEffect
+
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(
+        "ITEM_ID: sword\nNAME: Sword\nTYPE: weapon\nEFFECT: strength:5\n"
+        "COST: 10\nDESCRIPTION: Sharp\n\n"
+        "ITEM_ID: axe\nNAME: Axe\nTYPE: weapon\nEFFECT: strength:5\n"
+        "COST: 12\nDESCRIPTION: Heavy\n"
+    )
+    first = game_data.load_items(str(item_file))
+    snapshot_path = game_data.get_snapshot_path(str(item_file))
+    with open(snapshot_path, encoding="utf-8") as f:
+        assert json.load(f)["kind"] == "items"
+
+    # Restored items get their effects back, shared between equal strings
+    second = game_data.load_items(str(item_file))
+    assert second == first
+    assert isinstance(second['sword']['effect'], ItemEffect)
+    assert second['sword']['effect'] is second['axe']['effect']
+
+    # A pickle in place of the snapshot is never unpickled
+    with open(snapshot_path, "wb") as f:
+        pickle.dump({"version": game_data.SNAPSHOT_VERSION}, f)
+    assert game_data.load_items(str(item_file)) == first
+
+def test_get_quest_and_item_by_id(tmp_path):
+    """Test looking up single records through the offset index"""
+    import shutil
+    quest_file = shutil.copy("data/quests.txt", tmp_path / "quests.txt")
+    item_file = shutil.copy("data/items.txt", tmp_path / "items.txt")
+    quests = game_data.load_quests(str(quest_file))
+    items = game_data.load_items(str(item_file))
+
+    assert game_data.get_quest('orc_menace', str(quest_file)) == quests['orc_menace']
+    assert game_data.get_item('steel_armor', str(item_file)) == items['steel_armor']
+
+    from custom_exceptions import QuestNotFoundError, ItemNotFoundError
+    with pytest.raises(QuestNotFoundError):
+        game_data.get_quest('no_such_quest', str(quest_file))
+    with pytest.raises(ItemNotFoundError):
+        game_data.get_item('no_such_item', str(item_file))
+
+def test_offset_index_invalidation(tmp_path):
+    """Test that editing a data file rebuilds its offset index"""
+    item_file = tmp_path / "items.txt"
+    block = ("ITEM_ID: {id}\nNAME: Thing\nTYPE: consumable\n"
+             "EFFECT: health:5\nCOST: {cost}\nDESCRIPTION: Test\n\n")
+    item_file.write_text(block.format(id="a", cost=1) + block.format(id="b", cost=2))
+
+    assert game_data.get_item('b', str(item_file))['cost'] == 2
+
+    item_file.write_text(block.format(id="new_item", cost=30) + block.format(id="b", cost=20))
+    assert game_data.get_item('b', str(item_file))['cost'] == 20
+    assert game_data.get_item('new_item', str(item_file))['cost'] == 30
+
+    # Same size and timestamp, but the stale offset of "b" now falls mid-block
+    stat = os.stat(item_file)
+    item_file.write_text(block.format(id="new_item", cost=30).replace("Test", "Testing")
+                         + block.format(id="b", cost=20).replace("Test", "T"))
+    assert os.path.getsize(item_file) == stat.st_size
+    os.utime(item_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert game_data.get_item('b', str(item_file))['cost'] == 20
+
+def test_offset_index_file_is_plain_json(tmp_path):
+    """Test that the stored offset index is JSON and is reused from disk"""
+    import json
+    import pickle
+
+    quest_file = tmp_path / "quests.jsonl"
+    quest_file.write_text(
+        '{"quest_id": 7, "title": "Numbered", "description": "Test", "reward_xp": 1, '
+        '"reward_gold": 1, "required_level": 1, "prerequisite": "NONE"}\n'
+    )
+    filename = str(quest_file)
+    index = game_data.load_offset_index(filename, game_data.QUEST_PARSER)
+    with open(game_data.get_index_path(filename), encoding="utf-8") as f:
+        assert json.load(f)["version"] == game_data.INDEX_VERSION
+
+    # Read back from the file, IDs keep their type
+    game_data._offset_indexes.clear()
+    assert game_data.load_offset_index(filename, game_data.QUEST_PARSER) == index
+    assert 7 in index
+
+    # A pickle in place of the index is never unpickled
+    game_data._offset_indexes.clear()
+    with open(game_data.get_index_path(filename), "wb") as f:
+        pickle.dump({"version": game_data.INDEX_VERSION}, f)
+    assert game_data.load_offset_index(filename, game_data.QUEST_PARSER) == index
+
+def test_lazy_catalog_parses_on_access(tmp_path):
+    """Test that LazyCatalog behaves like the loaded dict but parses lazily"""
+    import shutil
+    item_file = str(shutil.copy("data/items.txt", tmp_path / "items.txt"))
+    items = game_data.load_items(item_file)
+    catalog = game_data.load_item_catalog(item_file)
+
+    assert len(catalog) == len(items)
+    assert 'iron_sword' in catalog
+    assert catalog.loaded_count() == 0
+
+    assert catalog['iron_sword'] == items['iron_sword']
+    assert catalog.loaded_count() == 1
+    assert dict(catalog) == items
+
+def test_lazy_catalog_follows_file_edits(tmp_path):
+    """Test that LazyCatalog rescans an edited file and parse_all fails early"""
+    from custom_exceptions import InvalidDataFormatError
+    item_file = tmp_path / "items.txt"
+    block = ("ITEM_ID: {id}\nNAME: Thing\nTYPE: consumable\n"
+             "EFFECT: health:5\nCOST: {cost}\nDESCRIPTION: Test\n\n")
+    item_file.write_text(block.format(id="a", cost=1) + block.format(id="b", cost=2))
+    catalog = game_data.load_item_catalog(str(item_file))
+
+    item_file.write_text(block.format(id="longer_id", cost=10) + block.format(id="b", cost=20))
+    assert catalog['b']['cost'] == 20
+    assert set(catalog) == {"longer_id", "b"}
+
+    item_file.write_text(block.format(id="c", cost="lots"))
+    with pytest.raises(InvalidDataFormatError):
+        catalog.parse_all()
+
+    # A deleted file is reported as missing, not as a raw OSError
+    from custom_exceptions import MissingDataFileError
+    item_file.unlink()
+    with pytest.raises(MissingDataFileError):
+        len(catalog)
+    with pytest.raises(MissingDataFileError):
+        game_data.load_item_catalog(str(item_file))
+
+def test_main_load_game_data_creates_missing_files(tmp_path, monkeypatch, capsys):
+    """Test that the game falls back to default data files and stays lazy"""
+    import main
+    from custom_exceptions import InvalidDataFormatError
+    monkeypatch.chdir(tmp_path)
+
+    main.load_game_data()
+    assert "Creating default files" in capsys.readouterr().out
+    assert os.path.exists("data/quests.txt") and os.path.exists("data/items.txt")
+    assert main.all_items.loaded_count() == 0
+    assert len(main.all_quests) > 0
+
+    # Bad data is reported when the record is read, not at startup
+    with open("data/items.txt", "a", encoding="utf-8") as f:
+        f.write("\nITEM_ID: broken\nNAME: Broken\nTYPE: weapon\n"
+                "EFFECT: strength:5\nCOST: lots\nDESCRIPTION: Bad\n")
+    main.load_game_data()
+    assert "Creating default files" not in capsys.readouterr().out
+    with pytest.raises(InvalidDataFormatError):
+        main.all_items['broken']
+
+def test_load_sharded_quests(tmp_path):
+    """Test loading quest shards in parallel and detecting duplicate IDs"""
+    block = ("QUEST_ID: {id}\nTITLE: T\nDESCRIPTION: D\nREWARD_XP: 10\n"
+             "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n")
+    (tmp_path / "a.txt").write_text(block.format(id="q1") + block.format(id="q2"))
+    (tmp_path / "b.txt").write_text(block.format(id="q3"))
+
+    quests = game_data.load_quest_shards(str(tmp_path), max_workers=2)
+    assert sorted(quests) == ["q1", "q2", "q3"]
+
+    from custom_exceptions import DuplicateRecordError
+    (tmp_path / "c.txt").write_text(block.format(id="q1"))
+    with pytest.raises(DuplicateRecordError):
+        game_data.load_quest_shards(str(tmp_path), max_workers=2)
+
+def test_hot_reload_applies_only_changes(tmp_path):
+    """Test that reloading reports and applies added, removed and updated quests"""
+    block = ("QUEST_ID: {id}\nTITLE: T\nDESCRIPTION: D\nREWARD_XP: {xp}\n"
+             "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n")
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(block.format(id="keep", xp=10) + block.format(id="edit", xp=10)
+                          + block.format(id="drop", xp=10))
+
+    catalog = game_data.load_reloadable_quests(str(quest_file))
+    kept = catalog['keep']
+
+    quest_file.write_text(block.format(id="keep", xp=10) + block.format(id="edit", xp=999)
+                          + block.format(id="fresh", xp=10))
+    diff = catalog.reload()
+
+    assert diff == {"added": ["fresh"], "removed": ["drop"], "updated": ["edit"]}
+    assert catalog['edit']['reward_xp'] == 999
+    assert catalog['keep'] is kept  # unchanged block was not re-parsed
+    assert 'drop' not in catalog
+
+def test_loaded_records_are_slotted_and_dict_compatible(tmp_path):
+    """Test that loaded quests and items are compact records usable like dicts"""
+    import shutil
+    from game_records import Quest, Item
+
+    quest_file = str(shutil.copy("data/quests.txt", tmp_path / "quests.txt"))
+    item_file = str(shutil.copy("data/items.txt", tmp_path / "items.txt"))
+    quest = game_data.load_quests(quest_file)['goblin_hunter']
+    item = game_data.load_items(item_file)['iron_sword']
+
+    assert isinstance(quest, Quest) and isinstance(item, Item)
+    assert not hasattr(quest, '__dict__')
+    assert quest['required_level'] == 2
+    assert quest.get('prerequisite') == 'first_steps'
+    assert quest.get('missing', 'default') == 'default'
+    assert item == item.to_dict()
+    assert sys.getsizeof(quest) < sys.getsizeof(quest.to_dict())
+
+def test_jsonl_format_round_trip(tmp_path):
+    """Test converting data files to JSON Lines and back without changes"""
+    quests = game_data.load_quests("data/quests.txt", use_snapshot=False)
+    items = game_data.load_items("data/items.txt", use_snapshot=False)
+
+    quest_jsonl = str(tmp_path / "quests.jsonl")
+    item_jsonl = str(tmp_path / "items.jsonl")
+    assert game_data.convert_quest_file("data/quests.txt", quest_jsonl) == len(quests)
+    game_data.convert_item_file("data/items.txt", item_jsonl)
+
+    assert game_data.detect_format(quest_jsonl) == game_data.JSONL_FORMAT
+    assert game_data.load_quests(quest_jsonl, use_snapshot=False) == quests
+    assert game_data.load_items(item_jsonl, use_snapshot=False) == items
+    assert game_data.get_item('fire_staff', item_jsonl) == items['fire_staff']
+
+    # Back to text
+    item_text = str(tmp_path / "items_again.txt")
+    game_data.convert_item_file(item_jsonl, item_text)
+    assert game_data.load_items(item_text, use_snapshot=False) == items
+
+def test_benchmark_generator_produces_valid_data(tmp_path):
+    """Test that the benchmark's synthetic data loads and links up"""
+    from benchmarks import bench_game_data
+
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    bench_game_data.generate_quests(quest_file, 50)
+    bench_game_data.generate_items(item_file, 30)
+
+    quests = game_data.load_quests(quest_file, use_snapshot=False)
+    items = game_data.load_items(item_file, use_snapshot=False)
+
+    assert len(quests) == 50 and len(items) == 30
+    assert quest_handler.validate_quest_prerequisites(quests)
+    assert any(q['prerequisite'] != 'NONE' for q in quests.values())
+    assert {item['type'] for item in items.values()} == {'weapon', 'armor', 'consumable'}
+
 # ============================================================================
 # FULL GAME WORKFLOW TEST
 # ============================================================================